@@ -24,6 +24,17 @@ def get_user_info() -> dict:
 	}
 
 
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_csrf_token() -> str:
+	"""Get the session's CSRF token; wiki pages are cached and shared, so they do not embed it."""
+	had_token = bool(frappe.session.data.csrf_token)
+	csrf_token = frappe.sessions.get_csrf_token()
+	if not had_token:
+		# Persist the newly minted token with the session
+		frappe.db.commit()  # nosemgrep
+	return csrf_token
+
+
 @frappe.whitelist(allow_guest=True)
 def get_translations():
 	if frappe.session.user != "Guest":
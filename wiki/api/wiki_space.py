@@ -1,11 +1,41 @@
 import frappe
 from frappe import _
-from frappe.utils.nestedset import get_descendants_of
+
+from wiki.frappe_wiki.doctype.wiki_document.cache import clear_space_cache
+from wiki.frappe_wiki.doctype.wiki_document.tree import (
+	build_nested_tree,
+	get_owning_space,
+	get_subtree_rows,
+	get_tree_levels,
+	move_subtree,
+	rebuild_tree,
+)
+from wiki.frappe_wiki.doctype.wiki_document.wiki_document import (
+	get_wiki_space_for_parent,
+	get_wiki_space_for_root,
+	set_wiki_space_for_subtree,
+)
+
+# Columns of each node returned to the tree editor
+WIKI_TREE_FIELDS = [
+	"name",
+	"title",
+	"is_group",
+	"parent_wiki_document",
+	"route",
+	"is_published",
+	"sort_order",
+]
 
 
 @frappe.whitelist()
-def get_wiki_tree(space_id: str) -> dict:
-	"""Get the tree structure of Wiki Documents for a given Wiki Space."""
+def get_wiki_tree(space_id: str, depth: int | None = None) -> dict:
+	"""
+	Get the tree structure of Wiki Documents for a given Wiki Space.
+
+	Pass `depth` to load only that many levels; groups below it come with a
+	`child_count` and can be expanded with `get_wiki_subtree`.
+	"""
 	space = frappe.get_cached_doc("Wiki Space", space_id)
 	space.check_permission("read")
 
@@ -13,44 +43,33 @@ def get_wiki_tree(space_id: str) -> dict:
 		return {"children": [], "root_group": None}
 
 	root_group = space.root_group
-	descendants = get_descendants_of("Wiki Document", root_group, ignore_permissions=True)
+	if depth:
+		return {"children": _get_wiki_tree_levels(root_group, depth), "root_group": root_group}
 
-	if not descendants:
-		return {"children": [], "root_group": root_group}
+	rows = get_subtree_rows(root_group, WIKI_TREE_FIELDS)
+	for row in rows:
+		row["label"] = row["title"]
 
-	tree = _build_wiki_tree_for_api(descendants)
-	return {"children": tree, "root_group": root_group}
+	return {"children": build_nested_tree(rows), "root_group": root_group}
 
 
-def _build_wiki_tree_for_api(documents: list[str]) -> list[dict]:
-	"""Build a nested tree structure from a list of Wiki Document names."""
-	wiki_documents = frappe.db.get_all(
-		"Wiki Document",
-		fields=["name", "title", "is_group", "parent_wiki_document", "route", "is_published", "sort_order"],
-		filters={"name": ("in", documents)},
-		order_by="lft asc",
-	)
-
-	doc_map = {doc["name"]: {**doc, "label": doc["title"], "children": []} for doc in wiki_documents}
+@frappe.whitelist()
+def get_wiki_subtree(parent: str, depth: int = 1) -> dict:
+	"""Get `depth` levels of Wiki Documents below `parent`, for expanding a node of a lazily loaded tree."""
+	frappe.has_permission("Wiki Document", "read", doc=parent, throw=True)
+	return {"children": _get_wiki_tree_levels(parent, depth), "parent": parent}
 
-	root_nodes = []
-	for doc in wiki_documents:
-		parent_name = doc["parent_wiki_document"]
-		if parent_name and parent_name in doc_map:
-			doc_map[parent_name]["children"].append(doc_map[doc["name"]])
-		else:
-			root_nodes.append(doc_map[doc["name"]])
 
-	# Sort children by sort_order at each level (lft is used for tree structure, sort_order for display)
-	def sort_children(nodes):
-		nodes.sort(key=lambda x: (x.get("sort_order") or 0, x["name"]))
-		for node in nodes:
-			if node["children"]:
-				sort_children(node["children"])
+def _get_wiki_tree_levels(root: str, depth: int) -> list[dict]:
+	nodes = get_tree_levels(root, WIKI_TREE_FIELDS, depth)
 
-	sort_children(root_nodes)
+	stack = list(nodes)
+	while stack:
+		node = stack.pop()
+		node["label"] = node["title"]
+		stack.extend(node["children"])
 
-	return root_nodes
+	return nodes
 
 
 @frappe.whitelist()
@@ -85,22 +104,185 @@ def reorder_wiki_documents(
 	# Direct reorder for users with write permission
 	parent_changed = doc.parent_wiki_document != new_parent
 
-	if parent_changed:
-		frappe.db.set_value("Wiki Document", doc_name, "parent_wiki_document", new_parent)
-
 	# Batch update sort_order for all siblings
 	_batch_update_sort_order(siblings_list)
 
-	# Only rebuild the tree if parent changed (structural change)
+	wiki_space = _get_wiki_space_for_document(doc.name)
+
+	# Only touch lft/rgt if parent changed (structural change)
 	# For simple reorders, sort_order is sufficient
 	if parent_changed:
-		rebuild_wiki_tree()
-
-	_sync_main_revision_for_space(_get_wiki_space_for_document(doc.name))
+		new_space = get_wiki_space_for_parent(new_parent) if new_parent else get_wiki_space_for_root(doc_name)
+		moved = False
+		if wiki_space and new_space == wiki_space:
+			# Shift only the rows between the old and new position inside this space
+			moved = move_subtree(
+				doc_name,
+				new_parent,
+				before=_get_next_sibling(siblings_list, doc_name),
+				scope=frappe.get_cached_value("Wiki Space", wiki_space, "root_group"),
+			)
+
+		if not moved:
+			frappe.db.set_value("Wiki Document", doc_name, "parent_wiki_document", new_parent)
+			rebuild_wiki_tree()
+
+		if new_space != wiki_space:
+			# Moved into another space or to the top level: re-home the whole subtree
+			set_wiki_space_for_subtree(doc.name, new_space)
+			clear_space_cache(wiki_space)
+			wiki_space = new_space
+
+	_sync_main_revision_for_space(wiki_space, parents={new_parent})
+	clear_space_cache(wiki_space)
 
 	return {"is_contribution": False}
 
 
+@frappe.whitelist()
+def bulk_reorder_wiki_documents(operations: str | list) -> dict:
+	"""
+	Move and reorder many Wiki Documents at once.
+
+	All operations are applied in the same transaction, followed by a single
+	tree renumber and a single revision per affected space.
+
+	Args:
+			operations: JSON list of {doc_name, new_parent, new_index}, applied in order.
+					new_index is the position among the new parent's children.
+
+	Returns:
+			dict with is_contribution: False and the number of documents moved
+	"""
+	import json
+
+	operations = json.loads(operations) if isinstance(operations, str) else operations
+	if not operations:
+		return {"is_contribution": False, "moved": 0}
+
+	doc_names = [op["doc_name"] for op in operations]
+	seen = set()
+	for doc_name in doc_names:
+		if doc_name in seen:
+			frappe.throw(_("Wiki Document {0} can only be moved once per request").format(doc_name))
+		seen.add(doc_name)
+
+	current = {
+		doc.name: doc
+		for doc in frappe.get_all(
+			"Wiki Document",
+			fields=["name", "parent_wiki_document", "wiki_space"],
+			filters={"name": ("in", doc_names)},
+		)
+	}
+
+	new_parents = {}
+	for op in operations:
+		doc_name, new_parent = op["doc_name"], op.get("new_parent")
+		if doc_name not in current:
+			frappe.throw(_("Wiki Document {0} not found").format(doc_name), frappe.DoesNotExistError)
+		if not new_parent:
+			frappe.throw(_("A new parent is required to move {0}").format(doc_name))
+		if not frappe.has_permission("Wiki Document", "write", doc=doc_name):
+			frappe.throw(_("You do not have permission to reorder this document"))
+		new_parents[doc_name] = new_parent
+
+	_validate_no_cycles(new_parents)
+
+	# New sibling order for every parent that receives a document
+	siblings = {}
+	for doc in frappe.get_all(
+		"Wiki Document",
+		fields=["name", "parent_wiki_document", "sort_order"],
+		filters={"parent_wiki_document": ("in", list(set(new_parents.values())))},
+		order_by="sort_order asc, name asc",
+	):
+		if doc.name not in new_parents:
+			siblings.setdefault(doc.parent_wiki_document, []).append(doc.name)
+
+	for op in operations:
+		children = siblings.setdefault(new_parents[op["doc_name"]], [])
+		if op["doc_name"] in children:
+			children.remove(op["doc_name"])
+		children.insert(min(int(op.get("new_index") or 0), len(children)), op["doc_name"])
+
+	for children in siblings.values():
+		_batch_update_sort_order(children)
+
+	moved = {
+		name: parent for name, parent in new_parents.items() if current[name].parent_wiki_document != parent
+	}
+	space_of_parent = {parent: get_wiki_space_for_parent(parent) for parent in set(moved.values())}
+	old_spaces = {current[name].wiki_space for name in moved}
+	affected_spaces = {current[name].wiki_space for name in new_parents} | set(space_of_parent.values())
+	affected_spaces.discard(None)
+
+	if moved:
+		_batch_update_parent(moved)
+
+		new_spaces = set(space_of_parent.values())
+		if len(old_spaces | new_spaces) == 1 and None not in old_spaces:
+			rebuild_wiki_tree(frappe.get_cached_value("Wiki Space", new_spaces.pop(), "root_group"))
+		else:
+			rebuild_wiki_tree()
+
+		for name, parent in moved.items():
+			if space_of_parent[parent] != current[name].wiki_space:
+				set_wiki_space_for_subtree(name, space_of_parent[parent])
+
+	for wiki_space in affected_spaces:
+		_sync_main_revision_for_space(wiki_space, parents=set(new_parents.values()))
+		clear_space_cache(wiki_space)
+
+	return {"is_contribution": False, "moved": len(moved)}
+
+
+def _validate_no_cycles(new_parents: dict[str, str]) -> None:
+	"""Make sure no document ends up below itself once all moves are applied."""
+	parent_cache = dict(new_parents)
+
+	def get_parent(name):
+		if name not in parent_cache:
+			parent_cache[name] = frappe.db.get_value("Wiki Document", name, "parent_wiki_document")
+		return parent_cache[name]
+
+	for doc_name, new_parent in new_parents.items():
+		visited = {doc_name}
+		current = new_parent
+		while current:
+			if current in visited:
+				frappe.throw(_("Cannot move {0} below itself").format(doc_name))
+			visited.add(current)
+			current = get_parent(current)
+
+
+def _batch_update_parent(new_parents: dict[str, str]) -> None:
+	"""Set parent_wiki_document (and old_parent, so NestedSet does not move again) in a single query."""
+	cases = " ".join(["WHEN %s THEN %s"] * len(new_parents))
+	placeholders = ", ".join(["%s"] * len(new_parents))
+	values = [value for item in new_parents.items() for value in item]
+
+	frappe.db.sql(
+		f"""
+		UPDATE `tabWiki Document`
+		SET parent_wiki_document = CASE name {cases} END,
+			old_parent = CASE name {cases} END
+		WHERE name IN ({placeholders})
+		""",
+		(*values, *values, *new_parents),
+	)
+	for name in new_parents:
+		frappe.clear_document_cache("Wiki Document", name)
+
+
+def _get_next_sibling(siblings: list[str], doc_name: str) -> str | None:
+	"""Get the saved sibling that follows `doc_name` in the new order."""
+	if doc_name not in siblings:
+		return None
+	following = siblings[siblings.index(doc_name) + 1 :]
+	return next((name for name in following if not name.startswith("temp_")), None)
+
+
 def _batch_update_sort_order(siblings: list[str]) -> None:
 	"""Batch update sort_order for siblings in a single query."""
 	# Filter out temp items (drafts) - they don't exist in the database
@@ -134,91 +316,86 @@ def _batch_update_sort_order(siblings: list[str]) -> None:
 
 def _get_wiki_space_for_document(doc_name: str) -> str | None:
 	"""Get the wiki space that contains this document."""
-	# Walk up the tree to find a document that's a root_group for a space
-	current = doc_name
-	visited = set()
+	return frappe.db.get_value("Wiki Document", doc_name, "wiki_space") or get_owning_space(doc_name)
 
-	while current and current not in visited:
-		visited.add(current)
-
-		# Check if this document is the root_group of any space
-		space = frappe.db.get_value("Wiki Space", {"root_group": current}, "name")
-		if space:
-			return space
-
-		# Move up to parent
-		current = frappe.db.get_value("Wiki Document", current, "parent_wiki_document")
-
-	return None
 
+def _sync_main_revision_for_space(space_name: str | None, parents: set[str] | None = None) -> None:
+	"""
+	Refresh main_revision after direct edits to keep CRs aligned with live tree.
 
-def _sync_main_revision_for_space(space_name: str | None) -> None:
-	"""Refresh main_revision after direct edits to keep CRs aligned with live tree."""
+	When only the children of `parents` were reordered or moved, the new revision is
+	built from main_revision with just those placements changed. Otherwise the live
+	tree is snapshotted again.
+	"""
 	if not space_name:
 		return
 
 	from wiki.frappe_wiki.doctype.wiki_revision.wiki_revision import (
+		create_delta_revision,
 		create_revision_from_live_tree,
 	)
 
 	space = frappe.get_doc("Wiki Space", space_name)
-	revision = create_revision_from_live_tree(
-		space.name,
-		message="Direct reorder",
-		parent_revision=space.main_revision,
-	)
+	revision = None
+	if parents and space.main_revision:
+		changes = _get_placement_changes(space.name, space.main_revision, parents)
+		if changes is not None:
+			revision = create_delta_revision(space.main_revision, changes, message="Direct reorder")
+
+	if not revision:
+		revision = create_revision_from_live_tree(
+			space.name,
+			message="Direct reorder",
+			parent_revision=space.main_revision,
+		)
 	frappe.db.set_value("Wiki Space", space.name, "main_revision", revision.name)
 
 
-def rebuild_wiki_tree():
-	"""Rebuild the Wiki Document tree ordering siblings by sort_order field."""
-	from frappe.query_builder import Order
-	from frappe.query_builder.functions import Coalesce
-
-	doctype = "Wiki Document"
-	parent_field = "parent_wiki_document"
-	table = frappe.qb.DocType(doctype)
-
-	# Get all root nodes (no parent), ordered by sort_order then name
-	roots = (
-		frappe.qb.from_(table)
-		.where((table.parent_wiki_document == "") | (table.parent_wiki_document.isnull()))
-		.orderby(Coalesce(table.sort_order, 0), order=Order.asc)
-		.orderby(table.name, order=Order.asc)
-		.select(table.name)
-	).run(pluck="name")
-
-	frappe.db.auto_commit_on_many_writes = 1
-
-	right = 1
-	for root in roots:
-		right = _rebuild_wiki_node(doctype, root, right, parent_field)
-
-	frappe.db.auto_commit_on_many_writes = 0
-
-
-def _rebuild_wiki_node(doctype: str, name: str, left: int, parent_field: str) -> int:
-	"""Rebuild a single node and its children, ordering by sort_order."""
-	from frappe.query_builder import Order
-	from frappe.query_builder.functions import Coalesce
+def _get_placement_changes(space_name: str, main_revision: str, parents: set[str]) -> dict | None:
+	"""
+	Get doc_key -> {parent_key, order_index} for the children of `parents`.
 
-	right = left + 1
-	table = frappe.qb.DocType(doctype)
-	parent_col = getattr(table, parent_field)
+	Returns None if the live tree may have drifted from main_revision in other ways
+	(documents added, removed or saved since), as a delta would then miss those edits.
+	"""
+	revision = frappe.db.get_value("Wiki Revision", main_revision, ["created_at", "doc_count"], as_dict=True)
+	if not revision or not revision.created_at:
+		return None
+	if frappe.db.count("Wiki Document", {"wiki_space": space_name}) != revision.doc_count:
+		return None
+	if frappe.db.exists("Wiki Document", {"wiki_space": space_name, "modified": (">", revision.created_at)}):
+		return None
+
+	parent_keys = dict(
+		frappe.get_all(
+			"Wiki Document",
+			fields=["name", "doc_key"],
+			filters={"name": ("in", list(parents)), "wiki_space": space_name},
+			as_list=True,
+		)
+	)
+	children = frappe.get_all(
+		"Wiki Document",
+		fields=["doc_key", "parent_wiki_document", "sort_order"],
+		filters={"parent_wiki_document": ("in", list(parent_keys)), "wiki_space": space_name},
+	)
+	if not all(parent_keys.values()) or not all(child.doc_key for child in children):
+		return None
 
-	# Get children ordered by sort_order then name
-	children = (
-		frappe.qb.from_(table)
-		.where(parent_col == name)
-		.orderby(Coalesce(table.sort_order, 0), order=Order.asc)
-		.orderby(table.name, order=Order.asc)
-		.select(table.name)
-	).run(pluck="name")
+	return {
+		child.doc_key: {
+			"parent_key": parent_keys[child.parent_wiki_document],
+			"order_index": child.sort_order or 0,
+		}
+		for child in children
+	}
 
-	for child in children:
-		right = _rebuild_wiki_node(doctype, child, right, parent_field)
 
-	# Update lft and rgt
-	frappe.db.set_value(doctype, name, {"lft": left, "rgt": right}, update_modified=False)
+def rebuild_wiki_tree(root: str | None = None) -> int:
+	"""
+	Rebuild the Wiki Document tree ordering siblings by sort_order field.
 
-	return right + 1
+	Pass `root` to limit the rebuild to one subtree, e.g. a space's root group
+	after a move within that space. Returns the number of renumbered rows.
+	"""
+	return rebuild_tree(root)
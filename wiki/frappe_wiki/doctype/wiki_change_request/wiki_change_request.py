@@ -12,6 +12,8 @@ from frappe.model.document import Document
 from frappe.utils import now_datetime
 from frappe.website.utils import cleanup_page_name
 
+from wiki.frappe_wiki.doctype.wiki_document.cache import clear_space_cache, enqueue_space_cache_warmup
+from wiki.frappe_wiki.doctype.wiki_document.tree import move_subtree
 from wiki.frappe_wiki.doctype.wiki_revision.wiki_revision import (
 	build_tree_order,
 	clone_revision,
@@ -1192,8 +1194,17 @@ def apply_merge_revision(space: Document, revision: Document) -> None:
 		elif space.root_group:
 			parent_name = space.root_group
 
+		new_parent = None if doc_key == root_doc_key else parent_name or space.root_group
+
 		if doc_key in key_to_name:
-			doc = frappe.get_doc("Wiki Document", key_to_name[doc_key])
+			name = key_to_name[doc_key]
+			if (
+				new_parent
+				and frappe.db.get_value("Wiki Document", name, "parent_wiki_document") != new_parent
+			):
+				# Renumber only this space's range instead of NestedSet's table-wide shift on save
+				move_subtree(name, new_parent, scope=space.root_group)
+			doc = frappe.get_doc("Wiki Document", name)
 		else:
 			doc = frappe.new_doc("Wiki Document")
 			doc.doc_key = doc_key
@@ -1204,10 +1215,8 @@ def apply_merge_revision(space: Document, revision: Document) -> None:
 		doc.is_published = item.get("is_published")
 		doc.is_external_link = item.get("is_external_link")
 		doc.external_url = item.get("external_url")
-		if doc_key == root_doc_key:
-			doc.parent_wiki_document = None
-		else:
-			doc.parent_wiki_document = parent_name or space.root_group
+		doc.wiki_space = space.name
+		doc.parent_wiki_document = new_parent
 		doc.sort_order = item.get("order_index") or 0
 
 		content_blob = item.get("content_blob")
@@ -1222,3 +1231,5 @@ def apply_merge_revision(space: Document, revision: Document) -> None:
 			doc.save()
 
 	frappe.db.set_value("Wiki Space", space.name, "main_revision", revision.name)
+	clear_space_cache(space.name)
+	enqueue_space_cache_warmup(space.name)
@@ -0,0 +1,483 @@
+# Copyright (c) 2026, Frappe and contributors
+# For license information, please see license.txt
+
+"""
+Redis-backed caches used when rendering public Wiki Document pages.
+
+Every cache in this module is scoped to a Wiki Space. Entries carry the space's
+`main_revision` so a merge is picked up even if an invalidation is missed, and
+`clear_space_cache` drops everything for a space whenever its tree changes.
+"""
+
+import hashlib
+import pickle
+import time
+from datetime import datetime, timezone
+
+import frappe
+from frappe.utils import convert_utc_to_system_timezone, get_datetime
+from werkzeug.http import http_date, is_resource_modified
+
+import wiki
+from wiki.wiki.markdown import RENDERER_VERSION, render_markdown_batch, render_markdown_with_toc
+
+# Bump when templates/wiki/*.html change in a way that must invalidate browser caches
+TEMPLATE_VERSION = 3
+
+# Hash of space name -> timestamp of the last invalidation, used in HTTP validators
+SPACE_VERSION_CACHE_KEY = "wiki_space_cache_version"
+
+# Hash of space name -> {"main_revision": ..., "tree": [...]}
+SPACE_TREE_CACHE_KEY = "wiki_space_tree"
+
+# Hash per space: route -> {"prev", "next"}, plus the main_revision it was built from
+SPACE_ADJACENCY_CACHE_KEY = "wiki_space_adjacency"
+ADJACENCY_REVISION_FIELD = "::main_revision"
+
+# Hash of route -> {"name", "is_group", "is_published", "space", "redirect"} for known wiki routes
+ROUTE_INDEX_CACHE_KEY = "wiki_route_index"
+
+# space -> settings every page of the space shares (header, navbar, switcher, favicon)
+SPACE_CHROME_CACHE_KEY = "wiki_space_chrome"
+
+# Prefix for content-addressed (html, toc_headings) entries
+RENDERED_CONTENT_CACHE_KEY = "wiki_rendered_content"
+RENDERED_CONTENT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Hash per space: "<lang>::<route>" -> {"main_revision": ..., "cached_at": ..., "html": ...}
+PAGE_HTML_CACHE_KEY = "wiki_page_html"
+# Pages show a relative "Last updated" date, so do not serve them for too long
+PAGE_HTML_CACHE_TTL = 60 * 60
+
+
+def get_space_main_revision(space: str) -> str:
+	return frappe.get_cached_value("Wiki Space", space, "main_revision") or ""
+
+
+def get_space_cache_version(space: str) -> float:
+	"""
+	Timestamp of the last change to anything rendered around a page of the space
+	(tree, titles, settings). Regenerated as "now" if Redis loses it, which only
+	makes validators more conservative.
+	"""
+	return frappe.cache.hget(SPACE_VERSION_CACHE_KEY, space, generator=time.time)
+
+
+def get_cached_space_navigation(space: str, root_group: str) -> dict:
+	"""
+	Get the materialized navigation data for a Wiki Space.
+
+	Returns a dict with the nested sidebar `tree`, built once per space revision
+	and shared by every page of the space, so a render only fetches it from Redis.
+	"""
+	main_revision = get_space_main_revision(space)
+	cached = frappe.cache.hget(SPACE_TREE_CACHE_KEY, space)
+	if cached and cached.get("main_revision") == main_revision:
+		return cached
+
+	return rebuild_space_navigation(space, root_group, main_revision)
+
+
+def get_cached_space_tree(space: str, root_group: str) -> list[dict]:
+	"""Get the materialized navigation tree for a Wiki Space."""
+	return get_cached_space_navigation(space, root_group)["tree"]
+
+
+def get_cached_adjacent_documents(space: str, root_group: str, route: str) -> dict:
+	"""
+	Look up the previous and next pages for a route in O(1).
+
+	Only the revision marker and the route's own entry are read from the space's
+	adjacency hash, not the whole navigation tree.
+	"""
+	cache_key = get_adjacency_cache_key(space)
+	main_revision = get_space_main_revision(space)
+	if frappe.cache.hget(cache_key, ADJACENCY_REVISION_FIELD) == main_revision:
+		adjacent = frappe.cache.hget(cache_key, route)
+	else:
+		adjacent = rebuild_space_navigation(space, root_group, main_revision)["adjacency"].get(route)
+	return adjacent or {"prev": None, "next": None}
+
+
+def get_adjacency_cache_key(space: str) -> str:
+	return f"{SPACE_ADJACENCY_CACHE_KEY}::{space}"
+
+
+def rebuild_space_navigation(
+	space: str, root_group: str | None = None, main_revision: str | None = None
+) -> dict:
+	"""
+	Build the navigation tree and adjacency map for a space and store them in the cache.
+
+	The adjacency map is written to its own hash in one round trip, with a field per
+	route, so page renders can fetch a single route's neighbours.
+	"""
+	from wiki.frappe_wiki.doctype.wiki_document.wiki_document import (
+		build_adjacency_map,
+		build_space_tree,
+	)
+
+	if root_group is None:
+		root_group = frappe.db.get_value("Wiki Space", space, "root_group")
+	if main_revision is None:
+		main_revision = get_space_main_revision(space)
+
+	tree = build_space_tree(root_group) if root_group else []
+	adjacency = build_adjacency_map(tree)
+	frappe.cache.hset(SPACE_TREE_CACHE_KEY, space, {"main_revision": main_revision, "tree": tree})
+
+	# Values are pickled the way frappe.cache.hget expects them
+	mapping = {route: pickle.dumps(adjacent) for route, adjacent in adjacency.items() if route}
+	mapping[ADJACENCY_REVISION_FIELD] = pickle.dumps(main_revision)
+	cache_key = frappe.cache.make_key(get_adjacency_cache_key(space))
+	pipeline = frappe.cache.pipeline()
+	pipeline.delete(cache_key)
+	pipeline.hset(cache_key, mapping=mapping)
+	pipeline.execute()
+
+	return {"main_revision": main_revision, "tree": tree, "adjacency": adjacency}
+
+
+def get_space_chrome(space: str) -> dict:
+	"""Get the page chrome of a space: its public settings, switcher entries and navbar items."""
+	return frappe.cache.hget(SPACE_CHROME_CACHE_KEY, space, generator=lambda: build_space_chrome(space))
+
+
+def build_space_chrome(space: str) -> dict:
+	from wiki.frappe_wiki.doctype.wiki_document.wiki_document import process_navbar_items
+
+	wiki_space = frappe.get_cached_doc("Wiki Space", space)
+	return {
+		"wiki_space": {
+			"name": wiki_space.name,
+			"space_name": wiki_space.space_name,
+			"route": wiki_space.route,
+			"root_group": wiki_space.root_group,
+			"is_published": wiki_space.is_published,
+			"enable_feedback_collection": wiki_space.enable_feedback_collection,
+			"light_mode_logo": wiki_space.light_mode_logo,
+			"dark_mode_logo": wiki_space.dark_mode_logo,
+			"app_switcher_logo": wiki_space.app_switcher_logo,
+			"favicon": wiki_space.favicon,
+		},
+		"wiki_spaces_for_switcher": frappe.get_all(
+			"Wiki Space",
+			fields=["name", "space_name", "route", "light_mode_logo", "app_switcher_logo"],
+			or_filters={"show_in_switcher": 1, "name": wiki_space.name},
+			order_by="switcher_order asc, space_name asc",
+		),
+		"navbar_items": process_navbar_items(wiki_space.navbar_items) if wiki_space.navbar_items else [],
+		"favicon": wiki_space.favicon,
+	}
+
+
+def clear_space_chrome_cache() -> None:
+	"""
+	Drop the chrome of every space, since each one lists all spaces in its switcher.
+
+	The cache version of every space is reset as well, so the validators of all
+	pages change and clients do not get a 304 for a stale switcher.
+	"""
+	frappe.cache.delete_value(SPACE_CHROME_CACHE_KEY)
+	frappe.cache.delete_value(SPACE_VERSION_CACHE_KEY)
+	if not frappe.flags.wiki_space_chrome_pending:
+		frappe.flags.wiki_space_chrome_pending = True
+		frappe.db.after_commit.add(_clear_space_chrome_cache_after_commit)
+
+
+def _clear_space_chrome_cache_after_commit() -> None:
+	frappe.cache.delete_value(SPACE_CHROME_CACHE_KEY)
+	frappe.cache.delete_value(SPACE_VERSION_CACHE_KEY)
+	frappe.flags.wiki_space_chrome_pending = False
+
+
+def enqueue_space_cache_warmup(space: str | None) -> None:
+	"""Rebuild the cached render data of a space in the background once the transaction commits."""
+	if not space:
+		return
+
+	frappe.enqueue(
+		"wiki.frappe_wiki.doctype.wiki_document.cache.warm_space_cache",
+		space=space,
+		# Rendering a large space can start a process pool and outlast the short queue's timeout
+		queue="long",
+		deduplicate=True,
+		job_id=f"wiki_space_cache_warmup::{space}",
+		enqueue_after_commit=True,
+	)
+
+
+def warm_space_cache(space: str) -> None:
+	"""Background job: pre-build navigation and page HTML so renders after a merge are cache hits."""
+	if not frappe.db.exists("Wiki Space", space):
+		return
+
+	rebuild_space_navigation(space)
+
+	root_group = frappe.db.get_value("Wiki Space", space, "root_group")
+	if not root_group:
+		return
+
+	lft, rgt = frappe.db.get_value("Wiki Document", root_group, ["lft", "rgt"])
+	contents = frappe.get_all(
+		"Wiki Document",
+		filters={"lft": (">", lft), "rgt": ("<", rgt), "is_group": 0, "is_published": 1},
+		pluck="content",
+	)
+	warm_rendered_content(contents)
+
+
+def resolve_route(route: str) -> dict | None:
+	"""
+	Resolve a website path to the Wiki Document to render or the page to redirect to.
+
+	Returns None for paths that are not wiki routes. Known routes are served from
+	a Redis index, so `WikiDocumentRenderer.can_render` needs a single lookup.
+	"""
+	entry = frappe.cache.hget(ROUTE_INDEX_CACHE_KEY, route)
+	if entry is None:
+		entry = build_route_entry(route)
+		# Unknown paths are not indexed to keep the index bounded by the number of documents
+		if entry is None:
+			return None
+		frappe.cache.hset(ROUTE_INDEX_CACHE_KEY, route, entry)
+	return entry
+
+
+def build_route_entry(route: str) -> dict | None:
+	document = frappe.db.get_value(
+		"Wiki Document", {"route": route}, ["name", "is_group", "is_published", "wiki_space"], as_dict=True
+	)
+	entry = {"name": None, "is_group": 0, "is_published": 0, "space": None, "redirect": None}
+
+	if document:
+		entry.update(is_group=document.is_group, is_published=document.is_published)
+		if not document.is_group and document.is_published:
+			entry.update(name=document.name, space=document.wiki_space)
+			return entry
+
+	# Groups and Wiki Space routes redirect to their first published page
+	root_group = None
+	if document and document.is_group:
+		root_group = document.name
+	else:
+		root_group = frappe.db.get_value("Wiki Space", {"route": route, "is_published": 1}, "root_group")
+
+	if not document and not root_group:
+		return None
+
+	if root_group:
+		entry["redirect"] = get_first_published_route(root_group)
+	return entry
+
+
+def get_first_published_route(root_group: str) -> str | None:
+	"""Route of the first published page below a group, in tree order."""
+	bounds = frappe.db.get_value("Wiki Document", root_group, ["lft", "rgt"])
+	if not bounds:
+		return None
+
+	lft, rgt = bounds
+	first_page = frappe.get_all(
+		"Wiki Document",
+		filters={"lft": (">", lft), "rgt": ("<", rgt), "is_group": 0, "is_published": 1},
+		pluck="route",
+		order_by="lft asc",
+		limit=1,
+	)
+	return first_page[0] if first_page else None
+
+
+def clear_route_index() -> None:
+	# Routes and redirect targets can move across spaces, so the index is rebuilt lazily as a whole
+	frappe.cache.delete_value(ROUTE_INDEX_CACHE_KEY)
+
+
+def get_content_hash(content: str) -> str:
+	"""sha256 of the Markdown source, the same hash stored in Wiki Content Blob."""
+	return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+
+def get_rendered_content_cache_key(content_hash: str) -> str:
+	return f"{RENDERED_CONTENT_CACHE_KEY}::v{RENDERER_VERSION}::{content_hash}"
+
+
+def get_rendered_content(content: str) -> tuple[str, list]:
+	"""
+	Render Markdown to HTML and TOC headings, reusing a cached render of identical content.
+
+	Entries are keyed by content hash and renderer version, so they never need
+	invalidation and are shared by every worker (and by identical pages across spaces).
+	"""
+	if not content:
+		return "", []
+
+	key = get_rendered_content_cache_key(get_content_hash(content))
+	cached = frappe.cache.get_value(key)
+	if cached:
+		return cached["html"], cached["toc_headings"]
+
+	html, toc_headings = render_markdown_with_toc(content)
+	frappe.cache.set_value(
+		key,
+		{"html": html, "toc_headings": toc_headings},
+		expires_in_sec=RENDERED_CONTENT_CACHE_TTL,
+	)
+	return html, toc_headings
+
+
+def warm_rendered_content(contents: list[str], workers: int | None = None) -> int:
+	"""
+	Render and cache every document in `contents` that is not cached yet.
+
+	Misses are rendered together with `render_markdown_batch`, so identical pages
+	are rendered once and large spaces use every core.
+
+	Returns:
+	        The number of distinct documents rendered
+	"""
+	missing = {}
+	for content in contents:
+		if not content:
+			continue
+		key = get_rendered_content_cache_key(get_content_hash(content))
+		if key not in missing and not frappe.cache.get_value(key):
+			missing[key] = content
+
+	rendered = render_markdown_batch(list(missing.values()), workers=workers)
+	for key, (html, toc_headings) in zip(missing, rendered, strict=True):
+		frappe.cache.set_value(
+			key,
+			{"html": html, "toc_headings": toc_headings},
+			expires_in_sec=RENDERED_CONTENT_CACHE_TTL,
+		)
+	return len(missing)
+
+
+def get_page_html_cache_key(space: str) -> str:
+	return f"{PAGE_HTML_CACHE_KEY}::{space}"
+
+
+def _get_page_html_field(route: str) -> str:
+	# Templates are translated, and a Guest's language can come from the request
+	return f"{frappe.local.lang}::{route}"
+
+
+def get_cached_page_html(space: str, route: str) -> str | None:
+	"""Get the fully rendered page for a route, or None if it is missing or stale."""
+	cached = frappe.cache.hget(get_page_html_cache_key(space), _get_page_html_field(route))
+	if not cached:
+		return None
+	if cached.get("main_revision") != get_space_main_revision(space):
+		return None
+	if time.time() - cached.get("cached_at", 0) > PAGE_HTML_CACHE_TTL:
+		return None
+	return cached["html"]
+
+
+def set_cached_page_html(space: str, route: str, html: str) -> None:
+	frappe.cache.hset(
+		get_page_html_cache_key(space),
+		_get_page_html_field(route),
+		{"main_revision": get_space_main_revision(space), "cached_at": time.time(), "html": html},
+	)
+
+
+def get_page_validators(doc, wiki_space: str | None = None, variant: str | None = None) -> dict:
+	"""
+	Build ETag / Last-Modified headers for a public page.
+
+	The ETag covers the content hash, the space's main_revision and cache version,
+	the renderer and template versions and the language, so it can be computed
+	without building the page context. Pages carry no per-session data (the CSRF
+	token is fetched by the page itself), so one ETag holds for every visitor of a
+	language and shared caches can revalidate.
+	"""
+	main_revision = get_space_main_revision(wiki_space) if wiki_space else ""
+	space_version = get_space_cache_version(wiki_space) if wiki_space else 0
+
+	parts = [
+		get_content_hash(doc.content),
+		doc.route or "",
+		str(doc.modified),
+		main_revision,
+		str(space_version),
+		f"r{RENDERER_VERSION}",
+		f"t{TEMPLATE_VERSION}",
+		wiki.__version__,
+		variant or "",
+		frappe.local.lang or "",
+	]
+	etag = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+
+	# Both sides in naive system time, like `modified`
+	last_modified = get_datetime(doc.modified)
+	if space_version:
+		space_changed_at = convert_utc_to_system_timezone(datetime.fromtimestamp(space_version, timezone.utc))
+		last_modified = max(last_modified, space_changed_at.replace(tzinfo=None))
+
+	return {
+		"ETag": f'"{etag}"',
+		"Last-Modified": http_date(last_modified),
+		"Cache-Control": "private, no-cache" if doc.is_private else "public, no-cache",
+	}
+
+
+def get_space_tree_validators(wiki_space: str) -> dict:
+	"""Build ETag / Last-Modified headers for the public tree of a space."""
+	space_version = get_space_cache_version(wiki_space)
+	parts = [wiki_space, get_space_main_revision(wiki_space), str(space_version), wiki.__version__]
+	etag = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+	space_changed_at = datetime.fromtimestamp(space_version, timezone.utc)
+
+	return {
+		"ETag": f'"{etag}"',
+		"Last-Modified": http_date(space_changed_at),
+		"Cache-Control": "public, no-cache",
+	}
+
+
+def is_not_modified(validators: dict) -> bool:
+	"""Check the current request's If-None-Match / If-Modified-Since against page validators."""
+	if not frappe.request or frappe.request.method not in ("GET", "HEAD"):
+		return False
+
+	return not is_resource_modified(
+		frappe.request.environ,
+		etag=validators["ETag"].strip('"'),
+		last_modified=validators["Last-Modified"],
+	)
+
+
+def clear_page_html_cache(space: str | None = None) -> None:
+	"""Drop cached pages of one space, or of every space when none is given."""
+	if space:
+		frappe.cache.delete_value(get_page_html_cache_key(space))
+	else:
+		frappe.cache.delete_keys(PAGE_HTML_CACHE_KEY)
+
+
+def clear_space_cache(space: str | None) -> None:
+	"""Invalidate all cached render data for a Wiki Space."""
+	if not space:
+		return
+
+	_clear_space_cache(space)
+
+	# A concurrent render could repopulate the cache from the pre-commit state,
+	# so clear again once the current transaction is committed.
+	pending = frappe.flags.setdefault("wiki_space_cache_pending", set())
+	if space not in pending:
+		pending.add(space)
+		frappe.db.after_commit.add(lambda: _clear_space_cache(space, after_commit=True))
+
+
+def _clear_space_cache(space: str, after_commit: bool = False) -> None:
+	frappe.cache.hdel(SPACE_TREE_CACHE_KEY, space)
+	frappe.cache.delete_value(get_adjacency_cache_key(space))
+	frappe.cache.hdel(SPACE_VERSION_CACHE_KEY, space)
+	clear_page_html_cache(space)
+	clear_route_index()
+
+	if after_commit:
+		frappe.flags.get("wiki_space_cache_pending", set()).discard(space)
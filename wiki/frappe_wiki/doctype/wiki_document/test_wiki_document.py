@@ -3,11 +3,15 @@
 
 import unittest
 from types import SimpleNamespace
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase
 
-from wiki.frappe_wiki.doctype.wiki_document.wiki_document import process_navbar_items
+from wiki.frappe_wiki.doctype.wiki_document.wiki_document import (
+	build_adjacency_map,
+	process_navbar_items,
+)
 from wiki.wiki.markdown import render_markdown, render_markdown_with_toc
 
 # On IntegrationTestCase, the doctype test records and all
@@ -107,6 +111,27 @@ class TestGetWebContext(IntegrationTestCase):
 		self.assertIsNotNone(context["next_doc"])
 		self.assertEqual(context["next_doc"]["title"], "Second Document")
 
+	def test_adjacent_documents_are_read_per_route(self):
+		"""Test that prev/next come from a per-route cache entry, not the navigation tree."""
+		from wiki.frappe_wiki.doctype.wiki_document.cache import (
+			SPACE_TREE_CACHE_KEY,
+			get_adjacency_cache_key,
+		)
+
+		root_group = self._create_wiki_document("Test Root Group", is_group=True)
+		doc1 = self._create_wiki_document("First Document", parent=root_group.name)
+		doc2 = self._create_wiki_document("Second Document", parent=root_group.name)
+		space = self._create_wiki_space("Test Space", "test-space", root_group.name)
+
+		doc1.reload()
+		doc1.get_web_context()
+
+		self.assertNotIn("adjacency", frappe.cache.hget(SPACE_TREE_CACHE_KEY, space.name))
+		doc2.reload()
+		adjacent = frappe.cache.hget(get_adjacency_cache_key(space.name), doc2.route)
+		self.assertEqual(adjacent["prev"]["title"], "First Document")
+		self.assertEqual(doc2.get_web_context()["prev_doc"]["title"], "First Document")
+
 	def test_last_document_has_no_next_doc(self):
 		"""Test that the last document in the tree has no next document."""
 		# Create a simple tree: Root Group -> Doc1 -> Doc2 -> Doc3
@@ -165,6 +190,41 @@ class TestGetWebContext(IntegrationTestCase):
 		self.assertIsNone(context["prev_doc"])
 		self.assertIsNone(context["next_doc"])
 
+	def test_cached_tree_is_invalidated_when_document_is_added(self):
+		"""Test that the cached space tree picks up documents created after it was built."""
+		root_group = self._create_wiki_document("Test Root Group Cache", is_group=True)
+		first_doc = self._create_wiki_document("Cached First", parent=root_group.name)
+		self._create_wiki_space("Test Space Cache", "test-space-cache", root_group.name)
+
+		first_doc.reload()
+		context = first_doc.get_web_context()
+		self.assertIsNone(context["next_doc"])
+
+		self._create_wiki_document("Cached Second", parent=root_group.name)
+
+		first_doc.reload()
+		context = first_doc.get_web_context()
+		self.assertEqual(context["next_doc"]["title"], "Cached Second")
+		self.assertEqual(
+			[node["title"] for node in context["nested_tree"]], ["Cached First", "Cached Second"]
+		)
+
+	def test_content_context_omits_sidebar_and_chrome(self):
+		"""Test that the slim content context carries page data and prev/next but no tree."""
+		root_group = self._create_wiki_document("Test Root Group", is_group=True)
+		doc1 = self._create_wiki_document("First Document", parent=root_group.name)
+		self._create_wiki_document("Second Document", parent=root_group.name)
+		self._create_wiki_space("Test Space", "test-space", root_group.name)
+
+		doc1.reload()
+		context = doc1.get_content_context()
+
+		self.assertEqual(context["title"], "First Document")
+		self.assertIn("Content for First Document", context["rendered_content"])
+		self.assertEqual(context["next_doc"]["title"], "Second Document")
+		for key in ("doc", "nested_tree", "navbar_items", "wiki_spaces_for_switcher"):
+			self.assertNotIn(key, context)
+
 	def test_wiki_spaces_for_switcher_includes_current_space_even_if_not_published(self):
 		"""
 		Test that wiki_spaces_for_switcher includes the current space
@@ -202,6 +262,45 @@ class TestGetWebContext(IntegrationTestCase):
 		# Ensure at least our 3 test spaces are included
 		self.assertGreaterEqual(len(switcher_spaces), 3)
 
+	def test_space_chrome_is_shared_and_refreshed_on_space_update(self):
+		"""Test that space settings are cached across pages and invalidated when the space changes."""
+		root_group = self._create_wiki_document("Test Root Group", is_group=True)
+		doc1 = self._create_wiki_document("First Document", parent=root_group.name)
+		doc2 = self._create_wiki_document("Second Document", parent=root_group.name)
+		space = self._create_wiki_space("Test Space", "test-space", root_group.name)
+
+		doc1.reload()
+		self.assertEqual(doc1.get_web_context()["wiki_space"].space_name, "Test Space")
+
+		doc2.reload()
+		with patch("frappe.get_all", wraps=frappe.get_all) as get_all:
+			doc2.get_web_context()
+		self.assertFalse([c for c in get_all.call_args_list if c.args and c.args[0] == "Wiki Space"])
+
+		space.reload()
+		space.space_name = "Renamed Space"
+		space.save()
+		doc2.reload()
+		self.assertEqual(doc2.get_web_context()["wiki_space"].space_name, "Renamed Space")
+
+	def test_space_update_changes_validators_of_other_spaces(self):
+		"""Test that pages of every space revalidate when a space in their switcher changes."""
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_page_validators
+
+		root_group = self._create_wiki_document("Test Root Group", is_group=True)
+		doc = self._create_wiki_document("First Document", parent=root_group.name)
+		space = self._create_wiki_space("Test Space", "test-space", root_group.name)
+		other_root = self._create_wiki_document("Other Root Group", is_group=True)
+		other_space = self._create_wiki_space("Other Space", "other-space", other_root.name)
+
+		etag = get_page_validators(doc, space.name)["ETag"]
+
+		other_space.reload()
+		other_space.space_name = "Renamed Space"
+		other_space.save()
+
+		self.assertNotEqual(etag, get_page_validators(doc, space.name)["ETag"])
+
 	def test_wiki_spaces_for_switcher_excludes_hidden_spaces(self):
 		"""
 		Test that wiki_spaces_for_switcher excludes spaces with show_in_switcher=False
@@ -315,6 +414,192 @@ class TestGetWebContext(IntegrationTestCase):
 		self.assertEqual(filtered_spaces, expected_order)
 
 
+class TestRenderedContentCache(IntegrationTestCase):
+	"""Tests for the content-hash keyed rendered HTML cache."""
+
+	def test_cache_hit_skips_markdown_rendering(self):
+		from wiki.frappe_wiki.doctype.wiki_document import cache
+
+		content = f"## Cached heading {frappe.generate_hash(length=8)}\n\nBody"
+		expected = render_markdown_with_toc(content)
+
+		with patch.object(cache, "render_markdown_with_toc", wraps=render_markdown_with_toc) as renderer:
+			self.assertEqual(cache.get_rendered_content(content), expected)
+			self.assertEqual(cache.get_rendered_content(content), expected)
+
+		renderer.assert_called_once_with(content)
+
+	def test_empty_content_is_not_cached(self):
+		from wiki.frappe_wiki.doctype.wiki_document import cache
+
+		self.assertEqual(cache.get_rendered_content(""), ("", []))
+		self.assertEqual(cache.get_rendered_content(None), ("", []))
+
+
+class TestPageHtmlCache(IntegrationTestCase):
+	"""Tests for the full-page HTML cache served to anonymous visitors."""
+
+	def setUp(self):
+		self.root_group = frappe.get_doc(
+			{"doctype": "Wiki Document", "title": "Page Cache Root", "is_group": 1}
+		).insert(ignore_permissions=True)
+		self.space = frappe.get_doc(
+			{
+				"doctype": "Wiki Space",
+				"space_name": "Page Cache Space",
+				"route": f"page-cache-{frappe.generate_hash(length=6)}",
+				"root_group": self.root_group.name,
+			}
+		).insert(ignore_permissions=True)
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_cached_page_is_returned_until_space_changes(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_cached_page_html, set_cached_page_html
+
+		route = f"{self.space.route}/intro"
+		set_cached_page_html(self.space.name, route, "<html>cached</html>")
+		self.assertEqual(get_cached_page_html(self.space.name, route), "<html>cached</html>")
+
+		frappe.get_doc(
+			{
+				"doctype": "Wiki Document",
+				"title": "New Page",
+				"parent_wiki_document": self.root_group.name,
+				"is_published": 1,
+			}
+		).insert(ignore_permissions=True)
+
+		self.assertIsNone(get_cached_page_html(self.space.name, route))
+
+	def test_cached_page_is_kept_per_language(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_cached_page_html, set_cached_page_html
+
+		route = f"{self.space.route}/intro"
+		lang = frappe.local.lang
+		try:
+			frappe.local.lang = "en"
+			set_cached_page_html(self.space.name, route, "<html>en</html>")
+			frappe.local.lang = "de"
+			self.assertIsNone(get_cached_page_html(self.space.name, route))
+		finally:
+			frappe.local.lang = lang
+
+	def test_space_settings_change_clears_cached_pages(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_cached_page_html, set_cached_page_html
+
+		route = f"{self.space.route}/intro"
+		set_cached_page_html(self.space.name, route, "<html>cached</html>")
+
+		self.space.favicon = "/files/favicon.png"
+		self.space.save(ignore_permissions=True)
+
+		self.assertIsNone(get_cached_page_html(self.space.name, route))
+
+
+class TestResolveRoute(IntegrationTestCase):
+	"""Tests for the route index used by WikiDocumentRenderer.can_render."""
+
+	def setUp(self):
+		self.root_group = frappe.get_doc(
+			{"doctype": "Wiki Document", "title": "Route Index Root", "is_group": 1}
+		).insert(ignore_permissions=True)
+		self.space = frappe.get_doc(
+			{
+				"doctype": "Wiki Space",
+				"space_name": "Route Index Space",
+				"route": f"route-index-{frappe.generate_hash(length=6)}",
+				"root_group": self.root_group.name,
+				"is_published": 1,
+			}
+		).insert(ignore_permissions=True)
+		self.page = frappe.get_doc(
+			{
+				"doctype": "Wiki Document",
+				"title": "Route Index Page",
+				"parent_wiki_document": self.root_group.name,
+				"is_published": 1,
+			}
+		).insert(ignore_permissions=True)
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_published_page_resolves_to_document(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import resolve_route
+
+		resolved = resolve_route(self.page.route)
+		self.assertEqual(resolved["name"], self.page.name)
+		self.assertEqual(resolved["space"], self.space.name)
+
+	def test_space_route_redirects_to_first_published_page(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import resolve_route
+
+		resolved = resolve_route(self.space.route)
+		self.assertIsNone(resolved["name"])
+		self.assertEqual(resolved["redirect"], self.page.route)
+
+	def test_unknown_route_is_not_resolved(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import resolve_route
+
+		self.assertIsNone(resolve_route(f"not-a-wiki-route-{frappe.generate_hash(length=6)}"))
+
+	def test_index_is_refreshed_when_page_is_unpublished(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import resolve_route
+
+		self.assertEqual(resolve_route(self.page.route)["name"], self.page.name)
+
+		self.page.is_published = 0
+		self.page.save(ignore_permissions=True)
+
+		self.assertIsNone(resolve_route(self.page.route)["name"])
+
+
+class TestPageValidators(IntegrationTestCase):
+	"""Tests for the ETag / Last-Modified headers of public pages."""
+
+	def _doc(self, content="Hello", modified="2026-01-01 10:00:00", is_private=0):
+		return SimpleNamespace(content=content, route="docs/hello", modified=modified, is_private=is_private)
+
+	def test_etag_is_stable_for_unchanged_page(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_page_validators
+
+		self.assertEqual(get_page_validators(self._doc())["ETag"], get_page_validators(self._doc())["ETag"])
+
+	def test_etag_changes_with_content(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_page_validators
+
+		etag = get_page_validators(self._doc())["ETag"]
+		self.assertNotEqual(etag, get_page_validators(self._doc(content="Changed"))["ETag"])
+
+	def test_etag_differs_per_payload_variant(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_page_validators
+
+		self.assertNotEqual(
+			get_page_validators(self._doc())["ETag"],
+			get_page_validators(self._doc(), variant="content")["ETag"],
+		)
+
+	def test_etag_differs_per_language(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_page_validators
+
+		lang = frappe.local.lang
+		try:
+			frappe.local.lang = "en"
+			etag = get_page_validators(self._doc())["ETag"]
+			frappe.local.lang = "de"
+			self.assertNotEqual(etag, get_page_validators(self._doc())["ETag"])
+		finally:
+			frappe.local.lang = lang
+
+	def test_private_pages_are_not_publicly_cacheable(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import get_page_validators
+
+		self.assertEqual(get_page_validators(self._doc())["Cache-Control"], "public, no-cache")
+		self.assertEqual(get_page_validators(self._doc(is_private=1))["Cache-Control"], "private, no-cache")
+
+
 class TestMarkdownCallouts(unittest.TestCase):
 	"""
 	Unit tests for the markdown callout/aside rendering.
@@ -773,6 +1058,74 @@ Yes, we conduct regular internal and external vulnerability scans on our cloud i
 		self.assertEqual(len(ids), len(set(ids)))
 
 
+class TestBuildAdjacencyMap(unittest.TestCase):
+	"""Unit tests for the route -> prev/next adjacency map built from the nested tree."""
+
+	def _page(self, title, route):
+		return {"title": title, "route": route, "is_group": 0, "children": []}
+
+	def _group(self, title, children):
+		return {"title": title, "route": title.lower(), "is_group": 1, "children": children}
+
+	def test_pages_are_linked_in_reading_order(self):
+		tree = [
+			self._page("Intro", "docs/intro"),
+			self._group("Guides", [self._page("Setup", "docs/setup"), self._page("Usage", "docs/usage")]),
+			self._page("FAQ", "docs/faq"),
+		]
+		adjacency = build_adjacency_map(tree)
+
+		self.assertIsNone(adjacency["docs/intro"]["prev"])
+		self.assertEqual(adjacency["docs/intro"]["next"]["route"], "docs/setup")
+		self.assertEqual(adjacency["docs/usage"]["prev"]["route"], "docs/setup")
+		self.assertEqual(adjacency["docs/usage"]["next"]["route"], "docs/faq")
+		self.assertIsNone(adjacency["docs/faq"]["next"])
+
+	def test_groups_are_not_included(self):
+		tree = [self._group("Guides", [self._page("Setup", "docs/setup")])]
+		adjacency = build_adjacency_map(tree)
+
+		self.assertEqual(list(adjacency), ["docs/setup"])
+
+
+class TestComputeNestedSet(unittest.TestCase):
+	"""Tests for the in-memory nested set computation."""
+
+	def test_siblings_are_numbered_by_sort_order_then_name(self):
+		from wiki.frappe_wiki.doctype.wiki_document.tree import compute_nested_set
+
+		nodes = [("root", None, 0), ("b", "root", 1), ("a", "root", 1), ("c", "root", 0), ("a1", "a", 0)]
+		self.assertEqual(
+			compute_nested_set(nodes),
+			{"root": (1, 10), "c": (2, 3), "a": (4, 7), "a1": (5, 6), "b": (8, 9)},
+		)
+
+	def test_subtree_numbering_starts_at_given_lft(self):
+		from wiki.frappe_wiki.doctype.wiki_document.tree import compute_nested_set
+
+		nodes = [("group", "outside", 0), ("page", "group", 0)]
+		self.assertEqual(compute_nested_set(nodes, start=7), {"group": (7, 10), "page": (8, 9)})
+
+
+class TestBuildNestedTree(unittest.TestCase):
+	"""Tests for assembling nested nodes from rows in lft order."""
+
+	def test_rows_are_nested_by_range_and_sorted_by_sort_order(self):
+		from wiki.frappe_wiki.doctype.wiki_document.tree import build_nested_tree
+
+		rows = [
+			{"name": "group", "sort_order": 1, "lft": 2, "rgt": 7},
+			{"name": "second", "sort_order": 1, "lft": 3, "rgt": 4},
+			{"name": "first", "sort_order": 0, "lft": 5, "rgt": 6},
+			{"name": "intro", "sort_order": 0, "lft": 8, "rgt": 9},
+		]
+		tree = build_nested_tree(rows)
+
+		self.assertEqual([node["name"] for node in tree], ["intro", "group"])
+		self.assertEqual([node["name"] for node in tree[1]["children"]], ["first", "second"])
+		self.assertNotIn("lft", tree[0])
+
+
 class TestProcessNavbarItems(unittest.TestCase):
 	"""
 	Unit tests for the process_navbar_items function.
@@ -0,0 +1,625 @@
+# Copyright (c) 2026, Frappe and contributors
+# For license information, please see license.txt
+
+"""
+Set-based maintenance of the Wiki Document nested set.
+
+Rather than walking the tree one query per node, the rows of a tree are loaded
+in a single query, `lft`/`rgt` are computed in memory and only the rows whose
+numbers changed are written back with chunked `CASE` updates.
+
+The accessors below resolve ancestors, descendants and the owning Wiki Space of
+a document in a single query. They read the nested set, and fall back to a
+recursive CTE over `parent_wiki_document` for rows that are not numbered yet.
+"""
+
+import frappe
+from frappe.query_builder.functions import Count
+from frappe.utils import now_datetime
+
+DOCTYPE = "Wiki Document"
+
+# Rows per bulk UPDATE statement
+UPDATE_CHUNK_SIZE = 1000
+
+# Above this many changed rows the whole document cache is dropped instead of per name
+CACHE_CLEAR_THRESHOLD = 100
+
+# Bound on the recursion of the CTE fallback, in case parent links form a cycle
+MAX_TREE_DEPTH = 100
+
+
+def get_subtree_rows(root: str, fields: list[str], condition=None) -> list[dict]:
+	"""
+	Load the descendants of `root` in `lft` order with a single range query.
+
+	Args:
+	        root: Document whose descendants are loaded
+	        fields: Columns to select; `lft` and `rgt` are always included
+	        condition: Optional query builder criterion on the descendants
+	"""
+	table = frappe.qb.DocType(DOCTYPE)
+	root_table = frappe.qb.DocType(DOCTYPE).as_("root")
+	query = (
+		frappe.qb.from_(table)
+		.join(root_table)
+		.on(root_table.name == root)
+		.select(*[table[field] for field in fields], table.lft, table.rgt)
+		.where((table.lft > root_table.lft) & (table.rgt < root_table.rgt))
+		.orderby(table.lft)
+	)
+	if condition is not None:
+		query = query.where(condition)
+	return query.run(as_dict=True)
+
+
+def build_nested_tree(rows: list[dict]) -> list[dict]:
+	"""
+	Assemble rows in `lft` order into nested nodes in a single pass.
+
+	A node is a child of the innermost open node whose `rgt` encloses it, so no
+	parent lookup is needed. Siblings are then ordered by (sort_order, name), which
+	is what editors control; this is close to linear as `lft` order usually agrees.
+	The `lft`/`rgt` columns are consumed and not returned.
+	"""
+	roots = []
+	sibling_lists = [roots]
+	# (rgt, children) of the nodes enclosing the current row
+	stack = []
+	for row in rows:
+		lft = row.pop("lft")
+		rgt = row.pop("rgt")
+		while stack and stack[-1][0] < lft:
+			stack.pop()
+
+		row["children"] = []
+		(stack[-1][1] if stack else roots).append(row)
+		if rgt > lft + 1:
+			stack.append((rgt, row["children"]))
+			sibling_lists.append(row["children"])
+
+	for siblings in sibling_lists:
+		siblings.sort(key=lambda node: (node.get("sort_order") or 0, node["name"]))
+
+	return roots
+
+
+def get_tree_levels(root: str, fields: list[str], depth: int) -> list[dict]:
+	"""
+	Load the first `depth` levels below `root`, one query per level.
+
+	Only visible rows are read, so the cost follows what is returned rather than
+	the size of the subtree. Every group carries `child_count` and
+	`children_loaded`; groups on the last level come with an empty `children`
+	list to be expanded on demand.
+	"""
+	roots = []
+	children_of = {root: roots}
+	parents = [root]
+	groups = []
+	for _level in range(max(depth, 1)):
+		rows = frappe.get_all(DOCTYPE, fields=fields, filters={"parent_wiki_document": ("in", parents)})
+		rows.sort(key=lambda node: (node.get("sort_order") or 0, node["name"]))
+
+		parents = []
+		for row in rows:
+			row["children"] = []
+			children_of[row.parent_wiki_document].append(row)
+			if row.is_group:
+				children_of[row.name] = row["children"]
+				parents.append(row.name)
+				groups.append(row)
+
+		if not parents:
+			break
+
+	# Groups on the last level were not expanded; count their children instead
+	unexpanded = set(parents)
+	child_counts = get_child_counts(parents)
+	for group in groups:
+		if group.name in unexpanded:
+			group["child_count"] = child_counts.get(group.name, 0)
+			group["children_loaded"] = False
+		else:
+			group["child_count"] = len(group["children"])
+			group["children_loaded"] = True
+
+	return roots
+
+
+def get_child_counts(parents: list[str]) -> dict[str, int]:
+	"""Count the direct children of each of `parents` with one grouped query."""
+	if not parents:
+		return {}
+	table = frappe.qb.DocType(DOCTYPE)
+	rows = (
+		frappe.qb.from_(table)
+		.select(table.parent_wiki_document, Count("*"))
+		.where(table.parent_wiki_document.isin(parents))
+		.groupby(table.parent_wiki_document)
+	).run()
+	return dict(rows)
+
+
+def get_ancestors(name: str, fields: list[str] | None = None, include_self: bool = False) -> list[dict]:
+	"""
+	Get the ancestors of `name`, from its parent up to the root.
+
+	Args:
+	        name: Document whose ancestors are loaded
+	        fields: Columns to select, defaults to `name`
+	        include_self: Also return `name` itself, as the first row
+	"""
+	fields = fields or ["name"]
+	table = frappe.qb.DocType(DOCTYPE)
+	node = frappe.qb.DocType(DOCTYPE).as_("node")
+	rows = (
+		frappe.qb.from_(table)
+		.join(node)
+		.on((table.lft <= node.lft) & (table.rgt >= node.rgt))
+		.select(*[table[field] for field in fields])
+		.where((node.name == name) & (node.rgt > node.lft))
+		.orderby(table.lft, order=frappe.qb.desc)
+		.run(as_dict=True)
+	)
+	if not rows:
+		# Not numbered yet: follow the parent links instead
+		rows = _get_linked_rows(name, fields, "name", "parent_wiki_document")
+
+	return rows if include_self else rows[1:]
+
+
+def get_descendants(name: str, fields: list[str] | None = None, include_self: bool = False) -> list[dict]:
+	"""
+	Get all descendants of `name`, parents before their children.
+
+	Args:
+	        name: Document whose descendants are loaded
+	        fields: Columns to select, defaults to `name`
+	        include_self: Also return `name` itself, as the first row
+	"""
+	fields = fields or ["name"]
+	table = frappe.qb.DocType(DOCTYPE)
+	node = frappe.qb.DocType(DOCTYPE).as_("node")
+	rows = (
+		frappe.qb.from_(table)
+		.join(node)
+		.on((table.lft >= node.lft) & (table.rgt <= node.rgt))
+		.select(*[table[field] for field in fields])
+		.where((node.name == name) & (node.rgt > node.lft))
+		.orderby(table.lft)
+		.run(as_dict=True)
+	)
+	if not rows:
+		rows = _get_linked_rows(name, fields, "parent_wiki_document", "name")
+
+	return rows if include_self else rows[1:]
+
+
+def get_owning_space(name: str) -> str | None:
+	"""Get the Wiki Space whose root group is `name` or one of its ancestors."""
+	table = frappe.qb.DocType(DOCTYPE)
+	node = frappe.qb.DocType(DOCTYPE).as_("node")
+	space = frappe.qb.DocType("Wiki Space")
+	spaces = (
+		frappe.qb.from_(table)
+		.join(node)
+		.on((table.lft <= node.lft) & (table.rgt >= node.rgt))
+		.join(space)
+		.on(space.root_group == table.name)
+		.select(space.name)
+		.where((node.name == name) & (node.rgt > node.lft))
+		.orderby(table.lft, order=frappe.qb.desc)
+		.limit(1)
+		.run(pluck=True)
+	)
+	if spaces:
+		return spaces[0]
+
+	rows = _get_linked_rows(name, ["name"], "name", "parent_wiki_document", join_space=True)
+	return next((row.space for row in rows if row.space), None)
+
+
+def _get_linked_rows(
+	name: str, fields: list[str], link_column: str, next_column: str, join_space: bool = False
+) -> list[dict]:
+	"""
+	Walk parent links from `name` with a recursive CTE, nearest rows first.
+
+	Each step joins rows whose `link_column` equals the previous row's
+	`next_column`: (name, parent_wiki_document) walks up, the reverse walks down.
+	"""
+	columns = ", ".join(f"doc.`{field}`" for field in fields)
+	space_join = "LEFT JOIN `tabWiki Space` space ON space.root_group = doc.name" if join_space else ""
+	space_column = ", space.name AS space" if join_space else ""
+	return frappe.db.sql(
+		f"""
+		WITH RECURSIVE path (name, next_link, depth) AS (
+			SELECT name, `{next_column}`, 0
+			FROM `tabWiki Document`
+			WHERE name = %(name)s
+			UNION ALL
+			SELECT child.name, child.`{next_column}`, path.depth + 1
+			FROM `tabWiki Document` child
+			JOIN path ON child.`{link_column}` = path.next_link
+			WHERE path.depth < %(max_depth)s
+		)
+		SELECT {columns}{space_column}
+		FROM path
+		JOIN `tabWiki Document` doc ON doc.name = path.name
+		{space_join}
+		ORDER BY path.depth, doc.sort_order, doc.name
+		""",
+		{"name": name, "max_depth": MAX_TREE_DEPTH},
+		as_dict=True,
+	)
+
+
+def rebuild_tree(root: str | None = None) -> int:
+	"""
+	Recompute `lft`/`rgt` so that siblings are ordered by (sort_order, name).
+
+	Args:
+	        root: Rebuild only the subtree of this document, in place. Only valid when
+	                documents were moved within the subtree, so that it still spans the
+	                same range; a full rebuild is done if the subtree changed size.
+
+	Returns:
+	        Number of rows whose `lft`/`rgt` changed
+	"""
+	if root:
+		bounds = frappe.db.get_value(DOCTYPE, root, ["lft", "rgt"])
+		if bounds and bounds[0] and bounds[1]:
+			lft, rgt = bounds
+			nodes = _get_nodes(lft, rgt)
+			numbers = compute_nested_set(nodes, start=lft)
+			if numbers.get(root, (None, None))[1] == rgt:
+				return write_nested_set(numbers, nodes)
+
+	nodes = _get_nodes()
+	return write_nested_set(compute_nested_set(nodes), nodes)
+
+
+def compute_nested_set(nodes: list[tuple], start: int = 1) -> dict[str, tuple[int, int]]:
+	"""
+	Compute nested set numbers for a forest.
+
+	Args:
+	        nodes: (name, parent, sort_order) rows. Rows whose parent is not among the
+	                nodes are treated as roots.
+	        start: `lft` of the first root
+
+	Returns:
+	        dict of name -> (lft, rgt)
+	"""
+	children = {}
+	roots = []
+	names = {node[0] for node in nodes}
+	for name, parent, sort_order, *_ in nodes:
+		key = (sort_order or 0, name)
+		if parent and parent in names and parent != name:
+			children.setdefault(parent, []).append(key)
+		else:
+			roots.append(key)
+
+	numbers = {}
+	lft = {}
+	counter = start
+	# Iterative depth-first walk, so deep trees do not hit the recursion limit
+	stack = [(name, False) for _, name in sorted(roots, reverse=True)]
+	while stack:
+		name, visited = stack.pop()
+		if visited:
+			numbers[name] = (lft.pop(name), counter)
+			counter += 1
+			continue
+
+		lft[name] = counter
+		counter += 1
+		stack.append((name, True))
+		stack.extend((child, False) for _, child in sorted(children.get(name, ()), reverse=True))
+
+	return numbers
+
+
+def move_subtree(name: str, parent: str, before: str | None = None, scope: str | None = None) -> bool:
+	"""
+	Move a document and its subtree under `parent`, shifting only the rows in between.
+
+	The subtree lands right before the sibling `before`, or as the last child of
+	`parent`. Rows between the old and the new position shift by the width of the
+	subtree and the subtree shifts by the distance travelled, in a single UPDATE
+	limited to that interval, so the rest of the table is left untouched.
+
+	Args:
+	        name: Document to move
+	        parent: New parent
+	        before: Sibling under `parent` to place the document before
+	        scope: Root of the tree the move must stay within, e.g. a space's root group
+
+	Returns:
+	        False if the move leaves `scope`, in which case nothing is changed
+	"""
+	table = frappe.qb.DocType(DOCTYPE)
+	lft, rgt = frappe.db.get_value(DOCTYPE, name, ["lft", "rgt"])
+	parent_lft, parent_rgt = frappe.db.get_value(DOCTYPE, parent, ["lft", "rgt"])
+
+	if lft <= parent_lft <= rgt:
+		frappe.throw(frappe._("A document cannot be moved under itself or one of its descendants"))
+
+	if scope:
+		scope_lft, scope_rgt = frappe.db.get_value(DOCTYPE, scope, ["lft", "rgt"])
+		if not (
+			scope_lft <= lft and rgt <= scope_rgt and scope_lft <= parent_lft and parent_rgt <= scope_rgt
+		):
+			return False
+
+	target = parent_rgt
+	if before and before != name:
+		before_lft = frappe.db.get_value(DOCTYPE, {"name": before, "parent_wiki_document": parent}, "lft")
+		if before_lft:
+			target = before_lft
+
+	width = rgt - lft + 1
+	if target > rgt:
+		# Moving right: rows between the subtree and the target close the gap
+		low, high, shift, distance = rgt + 1, target - 1, -width, target - rgt - 1
+	else:
+		# Moving left: rows between the target and the subtree open the gap
+		low, high, shift, distance = target, lft - 1, width, target - lft
+
+	start, end = min(lft, low), max(rgt, high)
+	moved = frappe.db.sql(
+		"""
+		SELECT name FROM `tabWiki Document`
+		WHERE lft BETWEEN %(start)s AND %(end)s OR rgt BETWEEN %(start)s AND %(end)s
+		""",
+		{"start": start, "end": end},
+		pluck=True,
+	)
+
+	if low <= high:
+		frappe.db.sql(
+			"""
+			UPDATE `tabWiki Document`
+			SET lft = CASE
+					WHEN lft BETWEEN %(lft)s AND %(rgt)s THEN lft + %(distance)s
+					WHEN lft BETWEEN %(low)s AND %(high)s THEN lft + %(shift)s
+					ELSE lft END,
+				rgt = CASE
+					WHEN rgt BETWEEN %(lft)s AND %(rgt)s THEN rgt + %(distance)s
+					WHEN rgt BETWEEN %(low)s AND %(high)s THEN rgt + %(shift)s
+					ELSE rgt END
+			WHERE lft BETWEEN %(start)s AND %(end)s OR rgt BETWEEN %(start)s AND %(end)s
+			""",
+			{
+				"lft": lft,
+				"rgt": rgt,
+				"low": low,
+				"high": high,
+				"shift": shift,
+				"distance": distance,
+				"start": start,
+				"end": end,
+			},
+		)
+
+	# old_parent is kept in step so NestedSet does not move the node again on save
+	frappe.qb.update(table).set(table.parent_wiki_document, parent).set(table.old_parent, parent).where(
+		table.name == name
+	).run()
+
+	_clear_document_cache([name, *moved])
+	return True
+
+
+def check_subtree_deletable(name: str) -> list[str]:
+	"""
+	Throw if `name` or a descendant is a space's root group or is linked from outside the subtree.
+
+	Returns:
+	        The names of the subtree, `name` first
+	"""
+	lft, rgt = frappe.db.get_value(DOCTYPE, name, ["lft", "rgt"])
+	names = frappe.get_all(
+		DOCTYPE,
+		filters={"lft": (">=", lft), "rgt": ("<=", rgt)},
+		order_by="lft asc",
+		pluck="name",
+	)
+
+	root_of_space = frappe.db.get_value("Wiki Space", {"root_group": ("in", names)}, "name")
+	if root_of_space:
+		frappe.throw(
+			frappe._("Cannot delete the root group of Wiki Space {0}").format(root_of_space),
+			frappe.LinkExistsError,
+		)
+	_check_links(names)
+	return names
+
+
+def delete_subtree(name: str, publish_progress: bool = False) -> list[str]:
+	"""
+	Delete `name` and its descendants with set-based queries.
+
+	The rows of the `lft`/`rgt` range are deleted in chunks, then the gap is closed
+	with one update, instead of a per-document delete that renumbers the table each
+	time. Controller hooks do not run, so what `frappe.delete_doc` would do is done
+	here for the whole range: links from outside the subtree are checked first, a
+	Deleted Document is kept per row, and feedback, comments, shares, ToDos and
+	attachments of the rows are removed. Callers check permissions and clear the
+	space cache and search index, which is all `WikiDocument.on_trash` did.
+
+	Returns:
+	        The deleted names, `name` first
+	"""
+	lft, rgt = frappe.db.get_value(DOCTYPE, name, ["lft", "rgt"])
+	names = check_subtree_deletable(name)
+
+	for start in range(0, len(names), UPDATE_CHUNK_SIZE):
+		chunk = names[start : start + UPDATE_CHUNK_SIZE]
+		_add_to_deleted_documents(chunk)
+		frappe.db.delete("Wiki Feedback", {"wiki_document": ("in", chunk)})
+		frappe.db.delete("Comment", {"reference_doctype": DOCTYPE, "reference_name": ("in", chunk)})
+		frappe.db.delete("DocShare", {"share_doctype": DOCTYPE, "share_name": ("in", chunk)})
+		frappe.db.delete("ToDo", {"reference_type": DOCTYPE, "reference_name": ("in", chunk)})
+		for file_name in frappe.get_all(
+			"File",
+			filters={"attached_to_doctype": DOCTYPE, "attached_to_name": ("in", chunk)},
+			pluck="name",
+		):
+			# File.on_trash removes the file from disk
+			frappe.delete_doc("File", file_name, ignore_permissions=True)
+		frappe.db.delete(DOCTYPE, {"name": ("in", chunk)})
+		if publish_progress:
+			done = min(start + UPDATE_CHUNK_SIZE, len(names))
+			frappe.publish_progress(
+				done * 100 / len(names),
+				title=frappe._("Deleting pages"),
+				doctype=DOCTYPE,
+				docname=name,
+				description=frappe._("{0} of {1}").format(done, len(names)),
+			)
+
+	# Close the interval left by the deleted range
+	width = rgt - lft + 1
+	frappe.db.sql(
+		"""
+		UPDATE `tabWiki Document`
+		SET lft = CASE WHEN lft > %(rgt)s THEN lft - %(width)s ELSE lft END,
+			rgt = rgt - %(width)s
+		WHERE rgt > %(rgt)s
+		""",
+		{"rgt": rgt, "width": width},
+	)
+
+	_clear_document_cache(names)
+	return names
+
+
+def _check_links(names: list[str]) -> None:
+	"""Throw `LinkExistsError` if a document outside the subtree links to one of `names`."""
+	link_fields = frappe.get_all(
+		"DocField", filters={"fieldtype": "Link", "options": DOCTYPE}, fields=["parent", "fieldname"]
+	) + frappe.get_all(
+		"Custom Field",
+		filters={"fieldtype": "Link", "options": DOCTYPE},
+		fields=["dt as parent", "fieldname"],
+	)
+
+	for field in link_fields:
+		# Parent links stay inside the subtree and feedback is deleted with it
+		if field.parent in (DOCTYPE, "Wiki Feedback"):
+			continue
+		meta = frappe.get_meta(field.parent)
+		if meta.issingle or meta.is_virtual:
+			continue
+
+		for start in range(0, len(names), UPDATE_CHUNK_SIZE):
+			chunk = names[start : start + UPDATE_CHUNK_SIZE]
+			linked = frappe.db.get_value(
+				field.parent, {field.fieldname: ("in", chunk)}, ["name", field.fieldname], as_dict=True
+			)
+			if linked:
+				frappe.throw(
+					frappe._("Cannot delete {0} {1} because it is linked with {2} {3}").format(
+						DOCTYPE, linked[field.fieldname], field.parent, linked.name
+					),
+					frappe.LinkExistsError,
+				)
+
+
+def _add_to_deleted_documents(names: list[str]) -> None:
+	"""Keep a Deleted Document for each row, so deleted pages can be restored."""
+	for row in frappe.get_all(DOCTYPE, filters={"name": ("in", names)}, fields=["*"]):
+		frappe.get_doc(
+			{
+				"doctype": "Deleted Document",
+				"deleted_doctype": DOCTYPE,
+				"deleted_name": row.name,
+				"data": frappe.as_json({**row, "doctype": DOCTYPE}),
+				"owner": frappe.session.user,
+			}
+		).db_insert()
+
+
+def write_nested_set(numbers: dict[str, tuple[int, int]], nodes: list[tuple] | None = None) -> int:
+	"""Write `lft`/`rgt` back in chunked CASE updates, skipping rows that did not change."""
+	current = {node[0]: (node[3], node[4]) for node in nodes or ()}
+	changed = [(name, lr) for name, lr in numbers.items() if current.get(name) != lr]
+
+	for i in range(0, len(changed), UPDATE_CHUNK_SIZE):
+		_update_chunk(changed[i : i + UPDATE_CHUNK_SIZE])
+
+	_clear_document_cache([name for name, _lr in changed])
+	return len(changed)
+
+
+def write_routes(routes: dict[str, str]) -> None:
+	"""Write routes back in chunked CASE updates, touching `modified` like a save would."""
+	rows = list(routes.items())
+	now = now_datetime()
+	for i in range(0, len(rows), UPDATE_CHUNK_SIZE):
+		chunk = rows[i : i + UPDATE_CHUNK_SIZE]
+		cases = " ".join(["WHEN %s THEN %s"] * len(chunk))
+		placeholders = ", ".join(["%s"] * len(chunk))
+		frappe.db.sql(
+			f"""
+			UPDATE `tabWiki Document`
+			SET route = CASE name {cases} END,
+				modified = %s,
+				modified_by = %s
+			WHERE name IN ({placeholders})
+			""",
+			(
+				*(value for row in chunk for value in row),
+				now,
+				frappe.session.user,
+				*(name for name, _route in chunk),
+			),
+		)
+
+	_clear_document_cache(list(routes))
+
+
+def _clear_document_cache(names: list[str]) -> None:
+	if len(names) > CACHE_CLEAR_THRESHOLD:
+		frappe.clear_document_cache(DOCTYPE)
+		return
+	for name in names:
+		frappe.clear_document_cache(DOCTYPE, name)
+
+
+def _get_nodes(lft: int | None = None, rgt: int | None = None) -> list[tuple]:
+	"""Load (name, parent, sort_order, lft, rgt) for the whole table or a range."""
+	table = frappe.qb.DocType(DOCTYPE)
+	query = frappe.qb.from_(table).select(
+		table.name, table.parent_wiki_document, table.sort_order, table.lft, table.rgt
+	)
+	if lft is not None:
+		query = query.where((table.lft >= lft) & (table.rgt <= rgt))
+	return query.run()
+
+
+def _update_chunk(rows: list[tuple[str, tuple[int, int]]]) -> None:
+	frappe.db.sql(*build_nested_set_update(rows))
+
+
+def build_nested_set_update(rows: list[tuple[str, tuple[int, int]]]) -> tuple[str, list]:
+	"""Build the `CASE` UPDATE statement and its values for a chunk of (name, (lft, rgt)) rows."""
+	cases = " ".join(["WHEN %s THEN %s"] * len(rows))
+	placeholders = ", ".join(["%s"] * len(rows))
+	values = []
+	for name, (lft, _rgt) in rows:
+		values.extend((name, lft))
+	for name, (_lft, rgt) in rows:
+		values.extend((name, rgt))
+	values.extend(name for name, _lr in rows)
+
+	query = f"""
+		UPDATE `tabWiki Document`
+		SET lft = CASE name {cases} END,
+			rgt = CASE name {cases} END
+		WHERE name IN ({placeholders})
+		"""
+	return query, values
@@ -6,5 +6,17 @@ frappe.ui.form.on('Wiki Document', {
 		if (frm.doc.is_published) {
 			frm.add_web_link(`/${frm.doc.route}`, 'View in Website');
 		}
+
+		if (frm.doc.is_group && !frm.is_new() && frm.perm[0]?.write) {
+			frm.add_custom_button(__('Rebuild Routes'), () => {
+				frm.call('rebuild_routes').then((r) => {
+					frappe.show_alert({
+						message: __('{0} routes updated', [r.message.updated_count]),
+						indicator: 'green',
+					});
+					frm.reload_doc();
+				});
+			});
+		}
 	},
 });
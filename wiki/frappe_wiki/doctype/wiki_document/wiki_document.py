@@ -5,11 +5,39 @@ from urllib.parse import urlparse
 
 import frappe
 from frappe import _
+from frappe.permissions import get_role_permissions, get_user_permissions
 from frappe.utils import pretty_date
-from frappe.utils.nestedset import NestedSet, get_descendants_of
+from frappe.utils.nestedset import NestedSet
 from frappe.website.page_renderers.base_renderer import BaseRenderer
-
-from wiki.wiki.markdown import render_markdown_with_toc
+from werkzeug.wrappers import Response
+
+from wiki.frappe_wiki.doctype.wiki_document.cache import (
+	clear_route_index,
+	clear_space_cache,
+	get_cached_adjacent_documents,
+	get_cached_page_html,
+	get_cached_space_tree,
+	get_page_validators,
+	get_rendered_content,
+	get_space_chrome,
+	get_space_tree_validators,
+	is_not_modified,
+	resolve_route,
+	set_cached_page_html,
+)
+from wiki.frappe_wiki.doctype.wiki_document.tree import (
+	build_nested_tree,
+	check_subtree_deletable,
+	delete_subtree,
+	get_ancestors,
+	get_descendants,
+	get_owning_space,
+	get_subtree_rows,
+	write_routes,
+)
+
+# Sections with more descendants than this are deleted in a background job
+BULK_DELETE_JOB_THRESHOLD = 500
 
 # Mapping of known service domains to icon identifiers
 KNOWN_SERVICE_ICONS = {
@@ -81,17 +109,59 @@ class WikiDocument(NestedSet):
 		slug: DF.Data | None
 		sort_order: DF.Int
 		title: DF.Data
+		wiki_space: DF.Link | None
 	# end: auto-generated types
 
 	def validate(self):
 		self.set_doc_key()
 		self.set_slug()
 		self.set_sort_order_for_new_document()
+		self.set_wiki_space()
 		self.set_route()
 		self.remove_leading_slash_from_route()
 		self.validate_unique_route_for_leaves()
 		self.set_boilerplate_content()
 
+	def on_update(self):
+		super().on_update()
+		self.update_wiki_space_of_descendants()
+		self.clear_space_cache()
+
+	def on_trash(self, allow_root_deletion=False):
+		# Resolve the space before NestedSet detaches the node from the tree
+		self.clear_space_cache()
+		super().on_trash(allow_root_deletion)
+
+	def clear_space_cache(self):
+		"""Invalidate the cached navigation data of the space this document belongs to."""
+		wiki_space = self.get_wiki_space()
+		if wiki_space:
+			clear_space_cache(wiki_space.name)
+		else:
+			clear_route_index()
+
+	def set_wiki_space(self):
+		"""Inherit the owning Wiki Space from the parent when the document is created or moved."""
+		if not (self.is_new() or self.has_value_changed("parent_wiki_document")):
+			return
+
+		if self.parent_wiki_document:
+			self.wiki_space = get_wiki_space_for_parent(self.parent_wiki_document)
+		elif not self.is_new():
+			# Moved to the top level: it only stays in a space it is the root group of
+			self.wiki_space = get_wiki_space_for_root(self.name)
+
+	def update_wiki_space_of_descendants(self):
+		"""Carry a change of space over to the subtree of a moved group and drop the old space's cache."""
+		if self.is_new() or not self.has_value_changed("wiki_space"):
+			return
+
+		if self.is_group:
+			set_wiki_space_for_subtree(self.name, self.wiki_space)
+		previous = self.get_doc_before_save()
+		if previous and previous.wiki_space:
+			clear_space_cache(previous.wiki_space)
+
 	def validate_unique_route_for_leaves(self):
 		"""Ensure no two leaf documents (non-groups) share the same route."""
 		if self.is_group or not self.route:
@@ -161,39 +231,28 @@ class WikiDocument(NestedSet):
 			# Build route from ancestor path
 			route_parts = []
 
-			# For new documents, get_ancestors() won't work as lft/rgt aren't set yet
-			# Use parent_wiki_document to build the ancestor chain
+			# For new documents lft/rgt aren't set yet, so start from the parent
 			ancestors = []
-			if not self.is_new():
-				ancestors = self.get_ancestors()
-			else:
-				# Build ancestor list by traversing parent_wiki_document
-				current_parent = self.parent_wiki_document
-				while current_parent:
-					ancestors.append(current_parent)
-					current_parent = frappe.get_cached_value(
-						"Wiki Document", current_parent, "parent_wiki_document"
-					)
+			if self.parent_wiki_document:
+				ancestors = get_ancestors(
+					self.parent_wiki_document if self.is_new() else self.name,
+					fields=["name", "slug"],
+					include_self=self.is_new(),
+				)
 
 			# Get Wiki Space route as the base
-			root_group = None
 			if ancestors:
-				root_group = ancestors[-1]
-			elif self.parent_wiki_document:
-				root_group = self.parent_wiki_document
-
-			if root_group:
-				space_route = frappe.get_cached_value("Wiki Space", {"root_group": root_group}, "route")
+				space_route = frappe.get_cached_value(
+					"Wiki Space", {"root_group": ancestors[-1].name}, "route"
+				)
 				if space_route:
 					route_parts.append(space_route)
 
-			if ancestors:
-				# ancestors are ordered from immediate parent to root
-				# Exclude the root group (last item) as it's the Wiki Space root
-				for ancestor_name in reversed(ancestors[:-1]):
-					ancestor_slug = frappe.get_cached_value("Wiki Document", ancestor_name, "slug")
-					if ancestor_slug:
-						route_parts.append(ancestor_slug)
+			# ancestors are ordered from immediate parent to root
+			# Exclude the root group (last item) as it's the Wiki Space root
+			for ancestor in reversed(ancestors[:-1]):
+				if ancestor.slug:
+					route_parts.append(ancestor.slug)
 
 			# Add this document's slug
 			slug = self.slug or frappe.website.utils.cleanup_page_name(self.title).replace("_", "-")
@@ -205,24 +264,19 @@ class WikiDocument(NestedSet):
 		if self.route and self.route.startswith("/"):
 			self.route = self.route[1 : len(self.route)]
 
-	def get_root_group(self) -> str | None:
-		"""Get the root group (Wiki Space root) for this document."""
-		ancestors = self.get_ancestors()
-		if ancestors:
-			return ancestors[-1]
-		return self.parent_wiki_document
-
 	def get_wiki_space(self) -> dict | None:
 		"""Get the Wiki Space this document belongs to."""
-		root_group = self.get_root_group()
-		if not root_group:
+		if not self.wiki_space:
 			return None
 		return frappe.get_cached_value(
-			"Wiki Space", {"root_group": root_group}, ["name", "space_name", "route"], as_dict=True
+			"Wiki Space",
+			self.wiki_space,
+			["name", "space_name", "route", "root_group"],
+			as_dict=True,
 		)
 
-	def get_edit_link(self) -> str:
-		wiki_space = self.get_wiki_space()
+	def get_edit_link(self, wiki_space: dict | None = None) -> str:
+		wiki_space = wiki_space or self.get_wiki_space()
 		if not wiki_space:
 			return ""
 		return f"/wiki/spaces/{wiki_space.name}/page/{self.name}"
@@ -238,56 +292,27 @@ class WikiDocument(NestedSet):
 				frappe.PermissionError,
 			)
 
-	def check_published(self):
+	def check_published(self, wiki_space: dict | None = None):
 		if not self.is_published:
 			frappe.throw(
 				frappe._("Page not found"),
 				frappe.DoesNotExistError,
 			)
 
-		space = self.get_wiki_space()
-		space_doc = None
-		if space:
-			space_doc = frappe.get_cached_doc("Wiki Space", space["name"])
-		if space_doc and not space_doc.is_published:
+		space = wiki_space or self.get_wiki_space()
+		if space and not get_space_chrome(space["name"])["wiki_space"]["is_published"]:
 			frappe.throw(
 				frappe._("Page not found"),
 				frappe.DoesNotExistError,
 			)
 
-	def get_tree_and_navigation(self) -> tuple[list, dict]:
-		"""
-		Get the wiki tree and adjacent documents for navigation.
-
-		Returns:
-		        tuple of (nested_tree, adjacent_docs)
-		"""
-		root_group = self.get_root_group()
-		if not root_group:
-			return [], {"prev": None, "next": None}
-
-		descendants = get_descendants_of("Wiki Document", root_group, ignore_permissions=True)
-		nested_tree = build_nested_wiki_tree(descendants)
-		adjacent_docs = get_adjacent_documents(nested_tree, self.route)
-
-		return nested_tree, adjacent_docs
-
 	@frappe.whitelist()
 	def get_breadcrumbs(self) -> dict:
 		"""Get the breadcrumb trail for this Wiki Document including space info."""
-		ancestors = self.get_ancestors()
+		ancestors = get_ancestors(self.name, fields=["name", "title", "is_group"])
 
 		# Build breadcrumb items from ancestors (excluding root)
-		breadcrumb_items = []
-		for ancestor_name in reversed(ancestors):
-			doc = frappe.get_cached_doc("Wiki Document", ancestor_name)
-			breadcrumb_items.append(
-				{
-					"name": doc.name,
-					"title": doc.title,
-					"is_group": doc.is_group,
-				}
-			)
+		breadcrumb_items = list(reversed(ancestors))
 
 		# Get the space that owns this document tree
 		wiki_space = self.get_wiki_space()
@@ -308,58 +333,65 @@ class WikiDocument(NestedSet):
 			},
 		}
 
+	def get_content_context(self, wiki_space: dict | None = None) -> dict:
+		"""
+		Get the page-specific part of the render context: content, TOC and prev/next.
+
+		Used on its own by client-side navigation, which keeps the sidebar and
+		navbar of the page it started from.
+		"""
+		wiki_space = wiki_space or self.get_wiki_space()
+		self.check_guest_access()
+		self.check_published(wiki_space)
+
+		# Render markdown and extract TOC headings in one pass (cached by content hash)
+		rendered_content, toc_headings = get_rendered_content(self.content or "")
+
+		adjacent_docs = {"prev": None, "next": None}
+		if wiki_space:
+			adjacent_docs = get_cached_adjacent_documents(wiki_space.name, wiki_space.root_group, self.route)
+
+		return {
+			"title": self.title,
+			"route": self.route,
+			"rendered_content": rendered_content,
+			"toc_headings": toc_headings,
+			"raw_markdown": self.content or "",
+			"prev_doc": adjacent_docs["prev"],
+			"next_doc": adjacent_docs["next"],
+			"edit_link": self.get_edit_link(wiki_space),
+			"last_updated": pretty_date(self.modified),
+			"last_updated_on": frappe.utils.format_datetime(self.modified),
+		}
+
 	def get_web_context(self) -> dict:
 		"""Get all context needed to render this Wiki Document."""
-		self.check_guest_access()
-		self.check_published()
 		wiki_space = self.get_wiki_space()
 
-		# Render markdown and extract TOC headings in one pass
-		rendered_content, toc_headings = render_markdown_with_toc(self.content or "")
-
 		# Base context with defaults for orphan documents
 		context = {
 			"doc": self,
-			"title": self.title,
-			"route": self.route,
 			"wiki_space": None,
 			"wiki_spaces_for_switcher": [],
 			"navbar_items": [],
 			"favicon": None,
-			"rendered_content": rendered_content,
-			"toc_headings": toc_headings,
-			"raw_markdown": self.content or "",
 			"nested_tree": [],
-			"prev_doc": None,
-			"next_doc": None,
-			"edit_link": self.get_edit_link(),
-			"last_updated": pretty_date(self.modified),
-			"last_updated_on": frappe.utils.format_datetime(self.modified),
 			"hide_chrome": not wiki_space,
+			**self.get_content_context(wiki_space),
 		}
 
 		if not wiki_space:
 			return context
 
-		wiki_space_doc = frappe.get_cached_doc("Wiki Space", wiki_space.name)
-		nested_tree, adjacent_docs = self.get_tree_and_navigation()
-
+		# Header, navbar and switcher are shared by every page of the space
+		chrome = get_space_chrome(wiki_space.name)
 		context.update(
 			{
-				"wiki_space": wiki_space_doc,
-				"wiki_spaces_for_switcher": frappe.get_all(
-					"Wiki Space",
-					fields=["name", "space_name", "route", "light_mode_logo", "app_switcher_logo"],
-					or_filters={"show_in_switcher": 1, "name": wiki_space["name"]},
-					order_by="switcher_order asc, space_name asc",
-				),
-				"navbar_items": process_navbar_items(wiki_space_doc.navbar_items)
-				if wiki_space_doc.navbar_items
-				else [],
-				"favicon": wiki_space_doc.favicon,
-				"nested_tree": nested_tree,
-				"prev_doc": adjacent_docs["prev"],
-				"next_doc": adjacent_docs["next"],
+				"wiki_space": frappe._dict(chrome["wiki_space"]),
+				"wiki_spaces_for_switcher": chrome["wiki_spaces_for_switcher"],
+				"navbar_items": chrome["navbar_items"],
+				"favicon": chrome["favicon"],
+				"nested_tree": get_cached_space_tree(wiki_space.name, wiki_space.root_group),
 			}
 		)
 
@@ -368,47 +400,207 @@ class WikiDocument(NestedSet):
 	@frappe.whitelist()
 	def get_children_count(self) -> int:
 		"""Get the count of children for this Wiki Document that the user can read."""
-		descendants = get_descendants_of("Wiki Document", self.name)
-		if not descendants:
-			return 0
-
-		# Filter to only include documents the user has read permission for
-		permitted_descendants = [
-			name for name in descendants if frappe.has_permission("Wiki Document", "read", name)
-		]
-		return len(permitted_descendants)
+		if has_unrestricted_access():
+			# Every descendant is readable, so the nested set gives the count directly
+			return (self.rgt - self.lft - 1) // 2
+
+		# Let the permission query filter the subtree and count in SQL
+		result = frappe.get_list(
+			"Wiki Document",
+			filters={"lft": (">", self.lft), "rgt": ("<", self.rgt)},
+			fields=["count(name) as count"],
+		)
+		return result[0].count if result else 0
 
 	@frappe.whitelist()
 	def delete_with_children(self) -> dict:
-		"""Delete this Wiki Document and all its children."""
-		# Check permission on the root document
+		"""
+		Delete this Wiki Document and all its children.
+
+		Delete permission on the whole subtree, root groups and links from outside it
+		are checked before anything is deleted or queued. The subtree is removed with set-based queries (see `delete_subtree`);
+		sections larger than BULK_DELETE_JOB_THRESHOLD are deleted in a background job
+		that reports progress.
+		"""
+		self.check_subtree_delete_permission()
+
+		child_count = (self.rgt - self.lft - 1) // 2
+		if child_count > BULK_DELETE_JOB_THRESHOLD:
+			# Fail here rather than in the job, where the user would not see the error
+			check_subtree_deletable(self.name)
+			frappe.enqueue(
+				"wiki.frappe_wiki.doctype.wiki_document.wiki_document.delete_subtree_in_background",
+				queue="long",
+				timeout=3600,
+				job_id=f"wiki_delete_subtree::{self.name}",
+				deduplicate=True,
+				enqueue_after_commit=True,
+				name=self.name,
+			)
+			return {"deleted": self.name, "children_deleted": child_count, "queued": True}
+
+		delete_subtree_and_clear_cache(self.name)
+		return {"deleted": self.name, "children_deleted": child_count}
+
+	def check_subtree_delete_permission(self):
+		"""Throw unless the user may delete this document and every one of its descendants."""
 		if not frappe.has_permission("Wiki Document", "delete", doc=self.name):
 			frappe.throw(_("You don't have permission to delete this document"), frappe.PermissionError)
 
-		descendants = get_descendants_of("Wiki Document", self.name)
-		child_count = 0
-
-		# Check delete permission on all descendants before deleting any
-		if descendants:
-			for child_name in descendants:
-				if not frappe.has_permission("Wiki Document", "delete", doc=child_name):
-					frappe.throw(
-						_("You don't have permission to delete child document: {0}").format(child_name),
-						frappe.PermissionError,
-					)
-			child_count = len(descendants)
-
-		# Delete all descendants first (NestedSet requires this)
-		# Use frappe.get_doc().delete() to enforce permission checks
-		if descendants:
-			for child_name in reversed(descendants):
-				child_doc = frappe.get_doc("Wiki Document", child_name)
-				child_doc.delete()
-
-		# Delete the document itself
-		frappe.delete_doc("Wiki Document", self.name)
+		if has_unrestricted_access("delete"):
+			# Delete is granted on every row, so the descendants need no check of their own
+			return
 
-		return {"deleted": self.name, "children_deleted": child_count}
+		# Delete rules depend on the row, so check each descendant before deleting any
+		for child in get_descendants(self.name):
+			if not frappe.has_permission("Wiki Document", "delete", doc=child.name):
+				frappe.throw(
+					_("You don't have permission to delete child document: {0}").format(child.name),
+					frappe.PermissionError,
+				)
+
+	@frappe.whitelist()
+	def rebuild_routes(self) -> dict:
+		"""
+		Recompute the routes of this document and its descendants from their slugs.
+
+		Routes are permalinks, so they are left alone when a group is renamed or moved
+		and only rebuilt on request.
+		"""
+		self.check_permission("write")
+		return {"updated_count": rebuild_subtree_routes(self.name)}
+
+
+def has_unrestricted_access(ptype: str = "read") -> bool:
+	"""Check whether the current user has `ptype` on every Wiki Document, without per-row conditions."""
+	if frappe.session.user == "Administrator":
+		return True
+	if not frappe.has_permission("Wiki Document", ptype):
+		return False
+
+	role_permissions = get_role_permissions(frappe.get_meta("Wiki Document"))
+	return not (
+		role_permissions.get("if_owner", {}).get(ptype)
+		or get_user_permissions()
+		or frappe.get_hooks("permission_query_conditions").get("Wiki Document")
+		or frappe.get_hooks("has_permission").get("Wiki Document")
+	)
+
+
+def delete_subtree_and_clear_cache(name: str, publish_progress: bool = False) -> None:
+	"""Delete a Wiki Document with its descendants and drop what was cached or indexed for them."""
+	from wiki.frappe_wiki.doctype.wiki_document.wiki_sqlite_search import WikiSQLiteSearch
+
+	wiki_space = frappe.db.get_value("Wiki Document", name, "wiki_space")
+	names = delete_subtree(name, publish_progress=publish_progress)
+
+	if wiki_space:
+		clear_space_cache(wiki_space)
+	else:
+		clear_route_index()
+
+	search = WikiSQLiteSearch()
+	if search.is_search_enabled():
+		for doc_name in names:
+			search.remove_doc("Wiki Document", doc_name)
+
+
+def delete_subtree_in_background(name: str) -> None:
+	"""Background job for deleting large sections, see `WikiDocument.delete_with_children`."""
+	if not frappe.db.exists("Wiki Document", name):
+		return
+
+	# The job runs as the user who queued it; permissions may have changed since
+	frappe.get_doc("Wiki Document", name).check_subtree_delete_permission()
+	delete_subtree_and_clear_cache(name, publish_progress=True)
+
+
+def rebuild_subtree_routes(name: str) -> int:
+	"""
+	Recompute the routes of `name` and its descendants from the slug chain.
+
+	The subtree is loaded with one query, routes are derived in a single pass with
+	parents before children, leaf routes are checked for collisions in bulk and the
+	changed routes are written back with CASE updates.
+
+	Returns:
+	        The number of documents whose route changed
+	"""
+	from wiki.frappe_wiki.doctype.wiki_document.wiki_sqlite_search import WikiSQLiteSearch
+
+	rows = get_descendants(
+		name,
+		fields=["name", "title", "slug", "route", "is_group", "is_published", "parent_wiki_document"],
+		include_self=True,
+	)
+	ancestors = get_ancestors(name, fields=["name", "slug"])
+	root_group = ancestors[-1].name if ancestors else name
+	space_route = frappe.db.get_value("Wiki Space", {"root_group": root_group}, "route")
+
+	# Route prefix handed down to the children of each document
+	prefixes = {}
+	if ancestors:
+		parent_parts = [space_route, *(ancestor.slug for ancestor in reversed(ancestors[:-1]))]
+		prefixes[rows[0].parent_wiki_document] = "/".join(part for part in parent_parts if part)
+
+	routes = {}
+	for row in rows:
+		slug = row.slug or frappe.website.utils.cleanup_page_name(row.title).replace("_", "-")
+		if row.name == root_group and space_route:
+			# The root group takes the space route and contributes no slug of its own
+			route = space_route
+		else:
+			prefix = prefixes.get(row.parent_wiki_document)
+			route = f"{prefix}/{slug}" if prefix else slug
+		routes[row.name] = route
+		prefixes[row.name] = route
+
+	leaf_routes = {}
+	for row in rows:
+		if row.is_group:
+			continue
+		route = routes[row.name]
+		if route in leaf_routes:
+			frappe.throw(
+				_("Another page with the route '{0}' already exists: {1}").format(route, leaf_routes[route])
+			)
+		leaf_routes[route] = row.name
+
+	changed = {row.name: routes[row.name] for row in rows if routes[row.name] != row.route}
+	leaves = set(leaf_routes.values())
+	changed_leaf_routes = [route for doc_name, route in changed.items() if doc_name in leaves]
+	if changed_leaf_routes:
+		existing = frappe.get_all(
+			"Wiki Document",
+			fields=["name", "route"],
+			filters={"route": ("in", changed_leaf_routes), "is_group": 0, "name": ("not in", list(routes))},
+			limit=1,
+		)
+		if existing:
+			frappe.throw(
+				_("Another page with the route '{0}' already exists: {1}").format(
+					existing[0].route, existing[0].name
+				)
+			)
+
+	if not changed:
+		return 0
+
+	write_routes(changed)
+
+	wiki_space = frappe.db.get_value("Wiki Document", name, "wiki_space")
+	if wiki_space:
+		clear_space_cache(wiki_space)
+	else:
+		clear_route_index()
+
+	search = WikiSQLiteSearch()
+	if search.is_search_enabled():
+		for row in rows:
+			if row.name in changed and row.is_published and not row.is_group:
+				search.index_doc("Wiki Document", row.name)
+
+	return len(changed)
 
 
 class WikiDocumentRenderer(BaseRenderer):
@@ -416,120 +608,118 @@ class WikiDocumentRenderer(BaseRenderer):
 		if self.path == "wiki" or self.path.startswith("wiki/"):
 			return False
 
-		document = frappe.db.get_value(
-			"Wiki Document", {"route": self.path}, ["name", "is_group", "is_published"], as_dict=True
-		)
-		if document and not document.is_group and document.is_published:
-			self.wiki_doc_name = document.name
+		resolved = resolve_route(self.path)
+		if not resolved:
+			return False
+
+		if resolved["name"]:
+			self.wiki_doc_name = resolved["name"]
+			self.wiki_space = resolved["space"]
 			return True
 
-		# Get root group - either from a group document or from a Wiki Space route
-		root_group = None
-		if document and document.is_group:
-			root_group = document.name
-		else:
-			# Check if this is a Wiki Space route
-			root_group = frappe.db.get_value(
-				"Wiki Space", {"route": self.path, "is_published": 1}, "root_group"
-			)
-
-		# Redirect to first published child document if available
-		if root_group:
-			child_docs = get_descendants_of(
-				"Wiki Document", root_group, order_by="lft asc, sort_order desc", ignore_permissions=True
-			)
-			for child_name in child_docs:
-				child_doc = frappe.get_cached_doc("Wiki Document", child_name)
-				if not child_doc.is_group and child_doc.is_published:
-					frappe.redirect("/" + child_doc.route)
+		# Groups and Wiki Space routes redirect to their first published page
+		if resolved["redirect"]:
+			frappe.redirect("/" + resolved["redirect"])
 
 		return False
 
 	def render(self):
 		doc = frappe.get_cached_doc("Wiki Document", self.wiki_doc_name)
-		context = doc.get_web_context()
-
-		csrf_token = frappe.sessions.get_csrf_token()
-		frappe.db.commit()  # nosemgrep
-
-		context["csrf_token"] = csrf_token
-
-		html = frappe.render_template("templates/wiki/document.html", context)
-		return self.build_response(html)
-
-
-def build_nested_wiki_tree(documents: list[str]):
-	# Create a mapping of document name to document data
-	wiki_documents = frappe.db.get_all(
-		"Wiki Document",
-		fields=[
-			"name",
-			"title",
-			"is_group",
-			"parent_wiki_document",
-			"route",
-			"sort_order",
-			"is_external_link",
-			"external_url",
-		],
-		filters={"name": ("in", documents)},
-		or_filters={"is_published": 1, "is_group": 1},
-		order_by="lft asc",
-	)
+		doc.check_guest_access()
+		doc.check_published()
 
-	doc_map = {doc["name"]: {**doc, "children": []} for doc in wiki_documents}
+		space_name = self.wiki_space
 
-	# Find root nodes and build the tree
-	root_nodes = []
+		# Answer revalidations before building any context
+		headers = get_page_validators(doc, space_name)
+		if is_not_modified(headers):
+			return self.build_response("", http_status_code=304, headers=headers)
 
-	for doc in wiki_documents:
-		parent_name = doc["parent_wiki_document"]
+		# Public pages look the same for every anonymous visitor, so serve them from cache
+		cacheable = space_name and frappe.session.user == "Guest" and not doc.is_private
 
-		# If parent exists in our dataset, add as child
-		if parent_name and parent_name in doc_map:
-			doc_map[parent_name]["children"].append(doc_map[doc["name"]])
-		else:
-			# This is a root node (parent not in our dataset)
-			root_nodes.append(doc_map[doc["name"]])
+		html = get_cached_page_html(space_name, doc.route) if cacheable else None
+		if html is None:
+			html = render_document_page(doc)
+			if cacheable:
+				set_cached_page_html(space_name, doc.route, html)
 
-	# Sort children by sort_order at each level
-	def sort_children(nodes):
-		nodes.sort(key=lambda x: (x.get("sort_order") or 0, x["name"]))
-		for node in nodes:
-			if node["children"]:
-				sort_children(node["children"])
-
-	sort_children(root_nodes)
-
-	# Remove empty groups recursively
-	def remove_empty_groups(nodes):
-		filtered_nodes = []
-		for node in nodes:
-			if node["is_group"]:
-				# Recursively filter children first
-				node["children"] = remove_empty_groups(node["children"])
-				# Only include group if it has children with content
-				if has_published_content(node):
-					filtered_nodes.append(node)
-			else:
-				# Include non-group nodes (they are already published due to DB filtering)
-				filtered_nodes.append(node)
-		return filtered_nodes
+		return self.build_response(html, headers=headers)
 
-	def has_published_content(node):
-		# If it's not a group, it has content (already filtered to be published at DB level)
-		if not node["is_group"]:
-			return True
 
-		# If it's a group, check if any of its children have content
-		if node["is_group"]:
-			for child in node["children"]:
-				if has_published_content(child):
-					return True
+def get_wiki_space_for_parent(parent: str) -> str | None:
+	"""Get the Wiki Space a child of `parent` belongs to."""
+	return frappe.db.get_value("Wiki Document", parent, "wiki_space") or get_owning_space(parent)
 
-		return False
 
-	return remove_empty_groups(root_nodes)
+def get_wiki_space_for_root(name: str) -> str | None:
+	"""Get the Wiki Space a top-level document belongs to, i.e. the one it is the root group of."""
+	return frappe.db.get_value("Wiki Space", {"root_group": name}, "name")
+
+
+def set_wiki_space_for_subtree(name: str, wiki_space: str | None) -> None:
+	"""Set the owning Wiki Space of a document and all of its descendants."""
+	lft, rgt = frappe.db.get_value("Wiki Document", name, ["lft", "rgt"])
+	WikiDocument = frappe.qb.DocType("Wiki Document")
+	subtree = (WikiDocument.lft >= lft) & (WikiDocument.rgt <= rgt)
+	names = frappe.qb.from_(WikiDocument).select(WikiDocument.name).where(subtree).run(pluck=True)
+
+	frappe.qb.update(WikiDocument).set(WikiDocument.wiki_space, wiki_space).where(subtree).run()
+	for doc_name in names:
+		frappe.clear_document_cache("Wiki Document", doc_name)
+
+
+def render_document_page(doc: WikiDocument, absolute_dates: bool = False) -> str:
+	"""
+	Render the full page HTML of a Wiki Document; it fetches the CSRF token itself.
+
+	With `absolute_dates`, "Last updated" shows the date instead of a relative time,
+	for pages that are stored and served long after they were rendered.
+	"""
+	context = doc.get_web_context()
+	if absolute_dates:
+		context["last_updated"] = _("on {0}").format(frappe.utils.format_date(doc.modified))
+	return frappe.render_template("templates/wiki/document.html", context)
+
+
+# Columns of each node in the public navigation tree
+PUBLIC_TREE_FIELDS = [
+	"name",
+	"title",
+	"is_group",
+	"parent_wiki_document",
+	"route",
+	"sort_order",
+	"is_external_link",
+	"external_url",
+]
+
+
+def build_space_tree(root_group: str) -> list[dict]:
+	"""Build the public navigation tree for everything below a space's root group."""
+	WikiDocument = frappe.qb.DocType("Wiki Document")
+	rows = get_subtree_rows(
+		root_group,
+		PUBLIC_TREE_FIELDS,
+		(WikiDocument.is_published == 1) | (WikiDocument.is_group == 1),
+	)
+	return remove_empty_groups(build_nested_tree(rows))
+
+
+def remove_empty_groups(nodes: list[dict]) -> list[dict]:
+	"""Drop groups that have no published page below them, recursively."""
+	filtered_nodes = []
+	for node in nodes:
+		if node["is_group"]:
+			# Recursively filter children first
+			node["children"] = remove_empty_groups(node["children"])
+			# Only include group if it has children with content
+			if node["children"]:
+				filtered_nodes.append(node)
+		else:
+			# Include non-group nodes (they are already published due to DB filtering)
+			filtered_nodes.append(node)
+	return filtered_nodes
 
 
 @frappe.whitelist()
@@ -540,54 +730,90 @@ def get_breadcrumbs(name: str) -> dict:
 
 
 @frappe.whitelist(allow_guest=True)
-def get_page_data(route: str) -> dict:
-	"""Returns all data needed to render a page dynamically for client-side navigation."""
+def get_page_data(route: str, mode: str | None = None) -> Response:
+	"""
+	Returns all data needed to render a page dynamically for client-side navigation.
+
+	With `mode="content"` only the content, TOC, title and prev/next are returned:
+	the tree is not built and the doc, sidebar and navbar are omitted. The sidebar
+	tree is available separately from `get_space_tree`.
+
+	The response carries ETag / Last-Modified validators, and conditional GETs
+	are answered with 304 before the page context is built.
+	"""
+	if mode not in (None, "", "content"):
+		frappe.throw(frappe._("Invalid mode: {0}").format(mode))
+
 	doc_name = frappe.db.get_value("Wiki Document", {"route": route, "is_published": 1}, "name")
 	if not doc_name:
 		frappe.throw(frappe._("Page not found"), frappe.DoesNotExistError)
 
 	doc = frappe.get_cached_doc("Wiki Document", doc_name)
-	return doc.get_web_context()
+	wiki_space = doc.get_wiki_space()
+	doc.check_guest_access()
+	doc.check_published(wiki_space)
 
+	headers = get_page_validators(doc, wiki_space.name if wiki_space else None, variant=mode)
+	if is_not_modified(headers):
+		return Response(status=304, headers=headers)
 
-def get_adjacent_documents(nested_tree: list, current_route: str) -> dict:
-	"""
-	Get the previous and next documents based on the flattened tree order.
-	Only returns non-group documents (actual pages).
+	data = doc.get_content_context(wiki_space) if mode == "content" else doc.get_web_context()
+	return _json_response(data, headers)
 
-	Args:
-	        nested_tree: The nested tree structure from build_nested_wiki_tree
-	        current_route: The route of the current document
 
-	Returns:
-	        dict with 'prev' and 'next' keys, each containing {title, route} or None
-	"""
+@frappe.whitelist(allow_guest=True)
+def get_space_tree(space: str) -> Response:
+	"""Returns the public sidebar tree of a Wiki Space, revalidated with ETag / Last-Modified."""
+	wiki_space = frappe.get_cached_doc("Wiki Space", space)
+	if not wiki_space.is_published or not wiki_space.root_group:
+		frappe.throw(frappe._("Page not found"), frappe.DoesNotExistError)
 
-	def flatten_tree(nodes: list) -> list:
-		"""Flatten the nested tree into a list of non-group documents in order."""
-		result = []
-		for node in nodes:
-			if not node.get("is_group"):
-				result.append({"title": node["title"], "route": node["route"]})
-			if node.get("children"):
-				result.extend(flatten_tree(node["children"]))
-		return result
+	headers = get_space_tree_validators(wiki_space.name)
+	if is_not_modified(headers):
+		return Response(status=304, headers=headers)
 
-	flat_list = flatten_tree(nested_tree)
+	return _json_response(
+		{"nested_tree": get_cached_space_tree(wiki_space.name, wiki_space.root_group)}, headers
+	)
 
-	# Find current document index
-	current_index = None
-	for i, doc in enumerate(flat_list):
-		if doc["route"] == current_route:
-			current_index = i
-			break
 
-	result = {"prev": None, "next": None}
+def _json_response(data: dict, headers: dict) -> Response:
+	return Response(
+		frappe.as_json({"message": data}, indent=None),
+		content_type="application/json",
+		headers=headers,
+	)
 
-	if current_index is not None:
-		if current_index > 0:
-			result["prev"] = flat_list[current_index - 1]
-		if current_index < len(flat_list) - 1:
-			result["next"] = flat_list[current_index + 1]
 
+def flatten_wiki_tree(nested_tree: list) -> list[dict]:
+	"""Flatten the nested tree into a list of non-group documents in reading order."""
+	result = []
+	for node in nested_tree:
+		if not node.get("is_group"):
+			result.append({"title": node["title"], "route": node["route"]})
+		if node.get("children"):
+			result.extend(flatten_wiki_tree(node["children"]))
 	return result
+
+
+def build_adjacency_map(nested_tree: list) -> dict[str, dict]:
+	"""
+	Build a route -> {prev, next} map for every page in the tree.
+
+	Args:
+	        nested_tree: The nested tree structure from build_space_tree
+
+	Returns:
+	        dict keyed by route, each value containing 'prev' and 'next' ({title, route} or None)
+	"""
+	flat_list = flatten_wiki_tree(nested_tree)
+	adjacency = {}
+	for i, doc in enumerate(flat_list):
+		# Keep the first occurrence, matching the linear scan this replaces
+		if doc["route"] in adjacency:
+			continue
+		adjacency[doc["route"]] = {
+			"prev": flat_list[i - 1] if i > 0 else None,
+			"next": flat_list[i + 1] if i < len(flat_list) - 1 else None,
+		}
+	return adjacency
@@ -21,6 +21,7 @@ class WikiSQLiteSearch(SQLiteSearch):
 				"title",
 				"content",
 				"route",
+				"wiki_space",
 				{"published": "is_published"},
 				"modified",
 			],
@@ -36,54 +37,61 @@ class WikiSQLiteSearch(SQLiteSearch):
 		"""Override to compute space and strip markdown from content"""
 		prepared = super().prepare_document(doc)
 		if prepared and doc.get("doctype") == "Wiki Document":
-			prepared["space"] = self._get_root_space(doc.get("name"))
+			prepared["space"] = self._get_root_space(doc)
 			if prepared.get("content"):
 				prepared["content"] = self._strip_markdown(prepared["content"])
 		return prepared
 
 	def _strip_markdown(self, text):
-		"""Convert markdown to plain text for cleaner search indexing"""
-		if not text:
-			return text
+		return strip_markdown(text)
 
-		# Remove code blocks (``` ... ```)
-		text = re.sub(r"```[\s\S]*?```", " ", text)
+	def _get_root_space(self, doc):
+		"""Get the root group of the wiki space a document belongs to"""
+		if doc.get("wiki_space"):
+			return frappe.get_cached_value("Wiki Space", doc.get("wiki_space"), "root_group") or doc.get(
+				"name"
+			)
+		return doc.get("name")
 
-		# Remove inline code (`code`)
-		text = re.sub(r"`[^`]+`", " ", text)
 
-		# Remove custom directives (:::note, :::danger, etc.)
-		text = re.sub(r":::[a-z]+\s*", " ", text)
-		text = re.sub(r":::\s*", " ", text)
+def strip_markdown(text):
+	"""Convert markdown to plain text for cleaner search indexing"""
+	if not text:
+		return text
 
-		# Remove images ![alt](url)
-		text = re.sub(r"!\[[^\]]*\]\([^)]+\)", " ", text)
+	# Remove code blocks (``` ... ```)
+	text = re.sub(r"```[\s\S]*?```", " ", text)
 
-		# Convert links [text](url) to just text
-		text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
+	# Remove inline code (`code`)
+	text = re.sub(r"`[^`]+`", " ", text)
 
-		# Remove headers (# ## ### etc.)
-		text = re.sub(r"^#{1,6}\s+", "", text, flags=re.MULTILINE)
+	# Remove custom directives (:::note, :::danger, etc.)
+	text = re.sub(r":::[a-z]+\s*", " ", text)
+	text = re.sub(r":::\s*", " ", text)
 
-		# Remove bold/italic markers
-		text = re.sub(r"\*{1,3}([^*]+)\*{1,3}", r"\1", text)
-		text = re.sub(r"_{1,3}([^_]+)_{1,3}", r"\1", text)
+	# Remove images ![alt](url)
+	text = re.sub(r"!\[[^\]]*\]\([^)]+\)", " ", text)
 
-		# Remove blockquotes
-		text = re.sub(r"^>\s+", "", text, flags=re.MULTILINE)
+	# Convert links [text](url) to just text
+	text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
 
-		# Remove horizontal rules
-		text = re.sub(r"^[-*_]{3,}\s*$", "", text, flags=re.MULTILINE)
+	# Remove headers (# ## ### etc.)
+	text = re.sub(r"^#{1,6}\s+", "", text, flags=re.MULTILINE)
 
-		# Remove HTML tags
-		text = re.sub(r"<[^>]+>", " ", text)
+	# Remove bold/italic markers
+	text = re.sub(r"\*{1,3}([^*]+)\*{1,3}", r"\1", text)
+	text = re.sub(r"_{1,3}([^_]+)_{1,3}", r"\1", text)
 
-		# Collapse multiple whitespace/newlines
-		text = re.sub(r"\s+", " ", text)
+	# Remove blockquotes
+	text = re.sub(r"^>\s+", "", text, flags=re.MULTILINE)
 
-		return text.strip()
+	# Remove horizontal rules
+	text = re.sub(r"^[-*_]{3,}\s*$", "", text, flags=re.MULTILINE)
 
-	def _get_root_space(self, docname):
-		"""Get the root wiki space for a document"""
-		wiki_doc = frappe.get_doc("Wiki Document", docname)
-		return wiki_doc.get_root_group() or docname
+	# Remove HTML tags
+	text = re.sub(r"<[^>]+>", " ", text)
+
+	# Collapse multiple whitespace/newlines
+	text = re.sub(r"\s+", " ", text)
+
+	return text.strip()
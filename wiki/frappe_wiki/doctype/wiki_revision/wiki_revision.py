@@ -150,6 +150,85 @@ def clone_revision(
 	return new_revision
 
 
+# Columns copied from one revision's items to the next
+REVISION_ITEM_FIELDS = [
+	"doc_key",
+	"title",
+	"slug",
+	"is_group",
+	"is_published",
+	"is_external_link",
+	"external_url",
+	"parent_key",
+	"order_index",
+	"content_blob",
+	"is_deleted",
+]
+
+
+def create_delta_revision(
+	parent_revision: str,
+	changes: dict[str, dict[str, Any]],
+	message: str | None = None,
+) -> Document | None:
+	"""
+	Create a revision that differs from `parent_revision` only in tree placement.
+
+	The parent's items are copied with one bulk insert and `changes`
+	(doc_key -> {parent_key, order_index}) are applied to the copied rows. Content
+	is not read or hashed again, so the parent's content hash is carried over.
+
+	Returns None if a changed doc_key is not part of the parent revision, in which
+	case the caller should snapshot the live tree instead.
+	"""
+	parent = frappe.db.get_value(
+		"Wiki Revision", parent_revision, ["wiki_space", "content_hash", "doc_count"], as_dict=True
+	)
+	items = frappe.get_all(
+		"Wiki Revision Item", fields=REVISION_ITEM_FIELDS, filters={"revision": parent_revision}
+	)
+	item_keys = {item["doc_key"] for item in items}
+	if not parent or not set(changes).issubset(item_keys):
+		return None
+
+	for item in items:
+		if item["doc_key"] in changes:
+			item.update(changes[item["doc_key"]])
+
+	revision = frappe.new_doc("Wiki Revision")
+	revision.wiki_space = parent.wiki_space
+	revision.parent_revision = parent_revision
+	revision.message = message or ""
+	revision.is_merge = 0
+	revision.is_working = 0
+	revision.created_by = frappe.session.user
+	revision.created_at = now_datetime()
+	revision.tree_hash = compute_tree_hash(items)
+	revision.content_hash = parent.content_hash
+	revision.doc_count = parent.doc_count
+	revision.insert()
+
+	now = now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Wiki Revision Item",
+		["name", "creation", "modified", "owner", "modified_by", "revision", *REVISION_ITEM_FIELDS],
+		[
+			(
+				frappe.generate_hash(length=10),
+				now,
+				now,
+				user,
+				user,
+				revision.name,
+				*(item.get(field) for field in REVISION_ITEM_FIELDS),
+			)
+			for item in items
+		],
+	)
+	return revision
+
+
 def get_or_create_content_blob(content: str, content_type: str = "markdown") -> str:
 	content = content or ""
 	hash_value = hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -185,25 +264,14 @@ def recompute_revision_hashes(revision: str) -> None:
 		)
 	}
 
-	tree_parts = []
 	content_parts = []
 	for item in sorted(items, key=lambda x: x["doc_key"]):
 		if item.get("is_deleted"):
 			continue
-		tree_parts.append(
-			"|".join(
-				[
-					item.get("doc_key") or "",
-					item.get("parent_key") or "",
-					str(item.get("order_index") or 0),
-					item.get("slug") or "",
-				]
-			)
-		)
 		content_hash = blob_hashes.get(item.get("content_blob")) or ""
 		content_parts.append(f"{item.get('doc_key') or ''}:{content_hash}")
 
-	tree_hash = hashlib.sha256("\n".join(tree_parts).encode("utf-8")).hexdigest()
+	tree_hash = compute_tree_hash(items)
 	content_hash = hashlib.sha256("\n".join(content_parts).encode("utf-8")).hexdigest()
 
 	frappe.db.set_value(
@@ -217,6 +285,24 @@ def recompute_revision_hashes(revision: str) -> None:
 	)
 
 
+def compute_tree_hash(items: list[dict[str, Any]]) -> str:
+	tree_parts = []
+	for item in sorted(items, key=lambda x: x["doc_key"]):
+		if item.get("is_deleted"):
+			continue
+		tree_parts.append(
+			"|".join(
+				[
+					item.get("doc_key") or "",
+					item.get("parent_key") or "",
+					str(item.get("order_index") or 0),
+					item.get("slug") or "",
+				]
+			)
+		)
+	return hashlib.sha256("\n".join(tree_parts).encode("utf-8")).hexdigest()
+
+
 def get_revision_item_map(revision: str) -> dict[str, dict[str, Any]]:
 	items = frappe.get_all(
 		"Wiki Revision Item",
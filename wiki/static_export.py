@@ -0,0 +1,277 @@
+# Copyright (c) 2025, Frappe and Contributors
+# See license.txt
+
+"""
+Static export of a Wiki Space.
+
+Writes every public page of a space as pre-rendered HTML (`<route>/index.html`),
+along with the sidebar tree and a search index under `_wiki/`, so that the space
+can be served by a plain web server without going through Python.
+
+Exports are incremental. `manifest.json` records a fingerprint per page built from
+its content hash, title, last modified time, the shape of the navigation tree and
+the space's chrome (navbar, logos, switcher); only pages whose fingerprint changed
+are rendered again. Since every page embeds the sidebar, a change in the tree
+re-renders the whole space, while content edits only re-render the edited pages.
+"""
+
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import frappe
+from frappe import _
+
+import wiki
+from wiki.frappe_wiki.doctype.wiki_document.cache import (
+	TEMPLATE_VERSION,
+	get_cached_space_tree,
+	get_content_hash,
+	warm_rendered_content,
+)
+from wiki.frappe_wiki.doctype.wiki_document.wiki_sqlite_search import strip_markdown
+from wiki.wiki.markdown import RENDERER_VERSION
+
+MANIFEST_FILE = "manifest.json"
+DATA_DIR = "_wiki"
+# Pages rendered per task handed to a worker process
+RENDER_CHUNK_SIZE = 50
+
+
+@frappe.whitelist()
+def enqueue_space_export(space: str) -> None:
+	"""Export a Wiki Space to static HTML in the background."""
+	frappe.get_cached_doc("Wiki Space", space).check_permission("write")
+	frappe.enqueue(
+		"wiki.static_export.export_space",
+		queue="long",
+		timeout=3600,
+		job_id=f"wiki_static_export::{space}",
+		deduplicate=True,
+		space=space,
+	)
+
+
+def get_export_path(space: str) -> str:
+	return frappe.get_site_path("wiki_export", space)
+
+
+def export_space(
+	space: str, output_dir: str | None = None, workers: int | None = None, force: bool = False
+) -> dict:
+	"""
+	Export the published pages of a Wiki Space to a static directory.
+
+	Args:
+	        space: Name of the Wiki Space
+	        output_dir: Target directory, defaults to `sites/<site>/wiki_export/<space>`
+	        workers: Number of render processes, defaults to the CPU count
+	        force: Render every page even if its fingerprint is unchanged
+
+	Returns:
+	        dict with the output directory and the number of rendered, skipped and removed pages
+	"""
+	wiki_space = frappe.get_doc("Wiki Space", space)
+	if not wiki_space.root_group:
+		frappe.throw(_("Wiki Space {0} has no root group").format(space))
+	if not wiki_space.is_published:
+		frappe.throw(_("Wiki Space {0} is not published").format(space))
+
+	output_dir = os.path.abspath(output_dir or get_export_path(space))
+	os.makedirs(output_dir, exist_ok=True)
+
+	nested_tree = get_cached_space_tree(wiki_space.name, wiki_space.root_group)
+	pages = get_exportable_pages(nested_tree)
+
+	base_fingerprint = "|".join(
+		[
+			_hash_json(nested_tree),
+			_get_chrome_hash(wiki_space),
+			f"r{RENDERER_VERSION}",
+			f"t{TEMPLATE_VERSION}",
+			wiki.__version__,
+		]
+	)
+	fingerprints = {
+		page.route: _hash_text(
+			"|".join([base_fingerprint, get_content_hash(page.content or ""), page.title, str(page.modified)])
+		)
+		for page in pages
+	}
+
+	previous = _read_manifest(output_dir).get("pages", {})
+	stale = [
+		page.name
+		for page in pages
+		if force
+		or previous.get(page.route) != fingerprints[page.route]
+		or not os.path.exists(get_page_path(output_dir, page.route))
+	]
+
+	# Render the Markdown of changed pages up front, once per distinct content
+	stale_pages = set(stale)
+	warm_rendered_content([page.content for page in pages if page.name in stale_pages], workers=workers)
+	render_pages(stale, output_dir, workers)
+
+	removed = [route for route in previous if route not in fingerprints]
+	for route in removed:
+		_remove_page(output_dir, route)
+
+	_write_file(
+		os.path.join(output_dir, DATA_DIR, "sidebar.json"),
+		json.dumps({"space": wiki_space.name, "nested_tree": nested_tree}, default=str),
+	)
+	_write_file(
+		os.path.join(output_dir, DATA_DIR, "search-index.json"),
+		json.dumps(
+			[
+				{"title": page.title, "route": page.route, "content": strip_markdown(page.content or "")}
+				for page in pages
+			]
+		),
+	)
+	_write_file(
+		os.path.join(output_dir, MANIFEST_FILE),
+		json.dumps({"space": wiki_space.name, "pages": fingerprints}, indent=1, sort_keys=True),
+	)
+
+	return {
+		"output_dir": output_dir,
+		"rendered": len(stale),
+		"skipped": len(pages) - len(stale),
+		"removed": len(removed),
+	}
+
+
+def get_exportable_pages(nested_tree: list) -> list[frappe._dict]:
+	"""Get the public pages of a space tree, in reading order."""
+	names = []
+	seen_routes = set()
+
+	def walk(nodes):
+		for node in nodes:
+			if (
+				not node.get("is_group")
+				and not node.get("is_external_link")
+				and node["route"] not in seen_routes
+			):
+				seen_routes.add(node["route"])
+				names.append(node["name"])
+			if node.get("children"):
+				walk(node["children"])
+
+	walk(nested_tree)
+	if not names:
+		return []
+
+	# Private pages need a session, so they are left out of the export
+	documents = frappe.get_all(
+		"Wiki Document",
+		fields=["name", "title", "route", "content", "modified"],
+		filters={"name": ("in", names), "is_private": 0},
+	)
+	position = {name: i for i, name in enumerate(names)}
+	return sorted(documents, key=lambda doc: position[doc.name])
+
+
+def render_pages(names: list[str], output_dir: str, workers: int | None = None) -> None:
+	"""Render Wiki Documents to `output_dir`, spreading the work across processes."""
+	if not names:
+		return
+
+	chunks = [names[i : i + RENDER_CHUNK_SIZE] for i in range(0, len(names), RENDER_CHUNK_SIZE)]
+	workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+	if workers <= 1:
+		_render_as_guest(names, output_dir)
+		return
+
+	# Spawn fresh interpreters instead of forking the current DB connection and locals
+	with ProcessPoolExecutor(
+		max_workers=workers,
+		mp_context=multiprocessing.get_context("spawn"),
+		initializer=_init_worker,
+		initargs=(frappe.local.site, frappe.local.sites_path),
+	) as executor:
+		for _result in executor.map(_render_chunk, chunks, [output_dir] * len(chunks)):
+			pass
+
+
+def get_page_path(output_dir: str, route: str) -> str:
+	path = os.path.normpath(os.path.join(output_dir, route.strip("/"), "index.html"))
+	if not path.startswith(output_dir + os.sep):
+		frappe.throw(_("Invalid route for export: {0}").format(route))
+	return path
+
+
+def _init_worker(site: str, sites_path: str) -> None:
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+
+
+def _render_chunk(names: list[str], output_dir: str) -> int:
+	_render_as_guest(names, output_dir)
+	return len(names)
+
+
+def _render_as_guest(names: list[str], output_dir: str) -> None:
+	from wiki.frappe_wiki.doctype.wiki_document.wiki_document import render_document_page
+
+	user = frappe.session.user
+	frappe.set_user("Guest")
+	try:
+		for name in names:
+			doc = frappe.get_doc("Wiki Document", name)
+			# Exported files are not re-rendered as time passes, so no relative dates
+			html = render_document_page(doc, absolute_dates=True)
+			_write_file(get_page_path(output_dir, doc.route), html)
+	finally:
+		frappe.set_user(user)
+
+
+def _get_chrome_hash(wiki_space) -> str:
+	"""Hash the space settings and switcher entries that every exported page embeds."""
+	switcher = frappe.get_all(
+		"Wiki Space",
+		fields=["name", "modified"],
+		filters={"show_in_switcher": 1},
+		order_by="name asc",
+	)
+	return _hash_json({"space": str(wiki_space.modified), "switcher": switcher})
+
+
+def _remove_page(output_dir: str, route: str) -> None:
+	path = get_page_path(output_dir, route)
+	with contextlib.suppress(FileNotFoundError):
+		os.remove(path)
+	# Prune directories left empty, stopping at the first one still in use
+	with contextlib.suppress(OSError):
+		os.removedirs(os.path.dirname(path))
+
+
+def _read_manifest(output_dir: str) -> dict:
+	try:
+		with open(os.path.join(output_dir, MANIFEST_FILE)) as f:
+			return json.load(f)
+	except (FileNotFoundError, ValueError):
+		return {}
+
+
+def _write_file(path: str, content: str) -> None:
+	"""Write atomically so a web server never serves a half-written file."""
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	tmp_path = f"{path}.tmp"
+	with open(tmp_path, "w") as f:
+		f.write(content)
+	os.replace(tmp_path, path)
+
+
+def _hash_json(value) -> str:
+	return _hash_text(json.dumps(value, sort_keys=True, default=str))
+
+
+def _hash_text(text: str) -> str:
+	return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -520,10 +520,8 @@ class TestWikiDocumentOrderingE2E(FrappeTestCase):
 
 	def test_order_consistency_between_admin_and_public(self):
 		"""Test that document order is consistent between admin API and public-facing tree."""
-		from frappe.utils.nestedset import get_descendants_of
-
 		from wiki.api.wiki_space import get_wiki_tree
-		from wiki.frappe_wiki.doctype.wiki_document.wiki_document import build_nested_wiki_tree
+		from wiki.frappe_wiki.doctype.wiki_document.wiki_document import build_space_tree
 
 		space = create_test_wiki_space()
 
@@ -555,8 +553,7 @@ class TestWikiDocumentOrderingE2E(FrappeTestCase):
 		admin_titles = [c["title"] for c in admin_tree["children"]]
 
 		# Get order from public-facing tree builder
-		descendants = get_descendants_of("Wiki Document", space.root_group, ignore_permissions=True)
-		public_tree = build_nested_wiki_tree(descendants)
+		public_tree = build_space_tree(space.root_group)
 		public_titles = [c["title"] for c in public_tree]
 
 		print(f"Admin API order: {admin_titles}")
@@ -571,10 +568,8 @@ class TestWikiDocumentOrderingE2E(FrappeTestCase):
 
 	def test_reorder_affects_public_facing_tree(self):
 		"""Test that reordering documents via API changes the public-facing tree order."""
-		from frappe.utils.nestedset import get_descendants_of
-
 		from wiki.api.wiki_space import get_wiki_tree, reorder_wiki_documents
-		from wiki.frappe_wiki.doctype.wiki_document.wiki_document import build_nested_wiki_tree
+		from wiki.frappe_wiki.doctype.wiki_document.wiki_document import build_space_tree
 
 		space = create_test_wiki_space()
 
@@ -601,8 +596,7 @@ class TestWikiDocumentOrderingE2E(FrappeTestCase):
 		frappe.db.commit()  # nosemgrep
 
 		# Verify initial public-facing order
-		descendants = get_descendants_of("Wiki Document", space.root_group, ignore_permissions=True)
-		public_tree_before = build_nested_wiki_tree(descendants)
+		public_tree_before = build_space_tree(space.root_group)
 		public_titles_before = [c["title"] for c in public_tree_before]
 		self.assertEqual(public_titles_before, ["Q1", "Q2", "Q3", "Q4", "Q5"])
 
@@ -631,8 +625,7 @@ class TestWikiDocumentOrderingE2E(FrappeTestCase):
 		# Clear cache and verify public-facing tree also changed
 		frappe.clear_cache()
 
-		descendants_after = get_descendants_of("Wiki Document", space.root_group, ignore_permissions=True)
-		public_tree_after = build_nested_wiki_tree(descendants_after)
+		public_tree_after = build_space_tree(space.root_group)
 		public_titles_after = [c["title"] for c in public_tree_after]
 
 		self.assertEqual(
@@ -649,10 +642,8 @@ class TestWikiDocumentOrderingE2E(FrappeTestCase):
 		4. Reorder items
 		5. Verify public side reflects changes
 		"""
-		from frappe.utils.nestedset import get_descendants_of
-
 		from wiki.api.wiki_space import get_wiki_tree, reorder_wiki_documents
-		from wiki.frappe_wiki.doctype.wiki_document.wiki_document import build_nested_wiki_tree
+		from wiki.frappe_wiki.doctype.wiki_document.wiki_document import build_space_tree
 
 		print("\n=== E2E Test: Full Ordering Workflow ===")
 
@@ -684,8 +675,7 @@ class TestWikiDocumentOrderingE2E(FrappeTestCase):
 
 		# Step 2: Verify order on public side
 		print("\nStep 2: Verifying public-facing order...")
-		descendants = get_descendants_of("Wiki Document", space.root_group, ignore_permissions=True)
-		public_tree = build_nested_wiki_tree(descendants)
+		public_tree = build_space_tree(space.root_group)
 		public_titles = [c["title"] for c in public_tree]
 		print(f"  Public order: {public_titles}")
 		self.assertEqual(public_titles, ["Folder1", "Folder2", "Folder3", "Folder4", "Folder5"])
@@ -744,8 +734,7 @@ class TestWikiDocumentOrderingE2E(FrappeTestCase):
 		print("\nStep 5: Verifying public-facing order after reorder...")
 		frappe.clear_cache()
 
-		descendants_after = get_descendants_of("Wiki Document", space.root_group, ignore_permissions=True)
-		public_tree_after = build_nested_wiki_tree(descendants_after)
+		public_tree_after = build_space_tree(space.root_group)
 		public_titles_after = [c["title"] for c in public_tree_after]
 		print(f"  Public order after reorder: {public_titles_after}")
 
@@ -863,6 +852,541 @@ class TestRebuildWikiTree(FrappeTestCase):
 		self.assertLess(page_c.lft, page_b.lft)
 		self.assertLess(page_b.lft, page_a.lft)
 
+	def test_rebuild_of_space_subtree_respects_sort_order(self):
+		"""Test that rebuilding only a space's root group reorders its pages in place."""
+		space = create_test_wiki_space()
+		page_b = create_wiki_document(space.root_group, "Page B")
+		page_a = create_wiki_document(space.root_group, "Page A")
+		root_bounds = frappe.db.get_value("Wiki Document", space.root_group, ["lft", "rgt"])
+
+		frappe.db.set_value("Wiki Document", page_a.name, "sort_order", 0)
+		frappe.db.set_value("Wiki Document", page_b.name, "sort_order", 1)
+
+		from wiki.api.wiki_space import rebuild_wiki_tree
+
+		rebuild_wiki_tree(space.root_group)
+
+		page_a.reload()
+		page_b.reload()
+		self.assertLess(page_a.lft, page_b.lft)
+		self.assertEqual(frappe.db.get_value("Wiki Document", space.root_group, ["lft", "rgt"]), root_bounds)
+
+	def test_move_into_group_leaves_other_spaces_untouched(self):
+		"""Test that a cross-parent reorder renumbers only the rows of its own space."""
+		from wiki.api.wiki_space import reorder_wiki_documents
+
+		other_space = create_test_wiki_space()
+		create_wiki_document(other_space.root_group, "Other Page")
+		space = create_test_wiki_space()
+		page = create_wiki_document(space.root_group, "Page")
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		child = create_wiki_document(group.name, "Child")
+
+		other_bounds = frappe.db.get_value("Wiki Document", other_space.root_group, ["lft", "rgt"])
+		root_bounds = frappe.db.get_value("Wiki Document", space.root_group, ["lft", "rgt"])
+
+		reorder_wiki_documents(
+			doc_name=page.name,
+			new_parent=group.name,
+			new_index=0,
+			siblings=json.dumps([page.name, child.name]),
+		)
+
+		page.reload()
+		group.reload()
+		child.reload()
+		self.assertEqual(page.parent_wiki_document, group.name)
+		self.assertTrue(group.lft < page.lft < page.rgt < child.lft < child.rgt < group.rgt)
+		self.assertEqual(frappe.db.get_value("Wiki Document", space.root_group, ["lft", "rgt"]), root_bounds)
+		self.assertEqual(
+			frappe.db.get_value("Wiki Document", other_space.root_group, ["lft", "rgt"]), other_bounds
+		)
+
+
+class TestBulkReorderWikiDocuments(FrappeTestCase):
+	"""Tests for the bulk_reorder_wiki_documents API."""
+
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+
+	def test_moves_are_applied_with_one_revision(self):
+		from wiki.api.wiki_space import bulk_reorder_wiki_documents
+
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		existing = create_wiki_document(group.name, "Existing")
+		page1 = create_wiki_document(space.root_group, "Page 1")
+		page2 = create_wiki_document(space.root_group, "Page 2")
+		revisions_before = frappe.db.count("Wiki Revision", {"wiki_space": space.name})
+
+		result = bulk_reorder_wiki_documents(
+			json.dumps(
+				[
+					{"doc_name": page2.name, "new_parent": group.name, "new_index": 0},
+					{"doc_name": page1.name, "new_parent": group.name, "new_index": 2},
+				]
+			)
+		)
+
+		self.assertEqual(result["moved"], 2)
+		self.assertEqual(frappe.db.count("Wiki Revision", {"wiki_space": space.name}), revisions_before + 1)
+
+		children = frappe.get_all(
+			"Wiki Document",
+			filters={"parent_wiki_document": group.name},
+			fields=["name", "sort_order", "lft", "rgt"],
+			order_by="sort_order asc",
+		)
+		self.assertEqual([child.name for child in children], [page2.name, existing.name, page1.name])
+
+		group.reload()
+		for child in children:
+			self.assertTrue(group.lft < child.lft < child.rgt < group.rgt)
+
+	def test_cycles_are_rejected(self):
+		from wiki.api.wiki_space import bulk_reorder_wiki_documents
+
+		space = create_test_wiki_space()
+		group_a = create_wiki_document(space.root_group, "Group A", is_group=True)
+		group_b = create_wiki_document(space.root_group, "Group B", is_group=True)
+
+		with self.assertRaises(frappe.ValidationError):
+			bulk_reorder_wiki_documents(
+				[
+					{"doc_name": group_a.name, "new_parent": group_b.name, "new_index": 0},
+					{"doc_name": group_b.name, "new_parent": group_a.name, "new_index": 0},
+				]
+			)
+
+	def test_duplicate_documents_are_rejected(self):
+		from wiki.api.wiki_space import bulk_reorder_wiki_documents
+
+		space = create_test_wiki_space()
+		group_a = create_wiki_document(space.root_group, "Group A", is_group=True)
+		group_b = create_wiki_document(space.root_group, "Group B", is_group=True)
+		page = create_wiki_document(space.root_group, "Page")
+
+		with self.assertRaises(frappe.ValidationError):
+			bulk_reorder_wiki_documents(
+				[
+					{"doc_name": page.name, "new_parent": group_a.name, "new_index": 0},
+					{"doc_name": page.name, "new_parent": group_b.name, "new_index": 0},
+				]
+			)
+
+		self.assertEqual(
+			frappe.db.get_value("Wiki Document", page.name, "parent_wiki_document"), space.root_group
+		)
+
+
+class TestLazyWikiTree(FrappeTestCase):
+	"""Tests for depth-limited loading of the wiki tree."""
+
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+
+	def test_depth_limited_tree_reports_child_counts(self):
+		from wiki.api.wiki_space import get_wiki_subtree, get_wiki_tree
+
+		space = create_test_wiki_space()
+		create_wiki_document(space.root_group, "Intro")
+		group = create_wiki_document(space.root_group, "Guides", is_group=True)
+		nested = create_wiki_document(group.name, "Advanced", is_group=True)
+		create_wiki_document(group.name, "Basics")
+		create_wiki_document(nested.name, "Deep Page")
+
+		tree = get_wiki_tree(space.name, depth=1)
+		guides = next(node for node in tree["children"] if node["name"] == group.name)
+		self.assertEqual(guides["children"], [])
+		self.assertEqual(guides["child_count"], 2)
+		self.assertFalse(guides["children_loaded"])
+
+		subtree = get_wiki_subtree(group.name, depth=1)
+		self.assertEqual([node["label"] for node in subtree["children"]], ["Advanced", "Basics"])
+		advanced = subtree["children"][0]
+		self.assertEqual(advanced["child_count"], 1)
+		self.assertFalse(advanced["children_loaded"])
+
+		full = get_wiki_tree(space.name, depth=3)
+		guides = next(node for node in full["children"] if node["name"] == group.name)
+		self.assertTrue(guides["children_loaded"])
+		self.assertEqual(guides["children"][0]["children"][0]["title"], "Deep Page")
+
+
+class TestWikiSpaceColumn(FrappeTestCase):
+	"""Tests for the denormalized wiki_space column on Wiki Document."""
+
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+
+	def test_new_documents_inherit_space(self):
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		page = create_wiki_document(group.name, "Page")
+
+		self.assertEqual(frappe.db.get_value("Wiki Document", space.root_group, "wiki_space"), space.name)
+		self.assertEqual(group.wiki_space, space.name)
+		self.assertEqual(page.wiki_space, space.name)
+		self.assertEqual(page.get_wiki_space().name, space.name)
+
+	def test_moving_group_to_another_space_moves_subtree(self):
+		space_a = create_test_wiki_space()
+		space_b = create_test_wiki_space()
+		group = create_wiki_document(space_a.root_group, "Group", is_group=True)
+		page = create_wiki_document(group.name, "Page")
+
+		group.reload()
+		group.parent_wiki_document = space_b.root_group
+		group.save()
+
+		self.assertEqual(frappe.db.get_value("Wiki Document", group.name, "wiki_space"), space_b.name)
+		self.assertEqual(frappe.db.get_value("Wiki Document", page.name, "wiki_space"), space_b.name)
+
+	def test_moving_page_to_another_space_clears_old_space_cache(self):
+		from wiki.frappe_wiki.doctype.wiki_document.cache import (
+			SPACE_TREE_CACHE_KEY,
+			rebuild_space_navigation,
+		)
+
+		space_a = create_test_wiki_space()
+		space_b = create_test_wiki_space()
+		page = create_wiki_document(space_a.root_group, "Page")
+		rebuild_space_navigation(space_a.name)
+
+		page.reload()
+		page.parent_wiki_document = space_b.root_group
+		page.save()
+
+		self.assertEqual(page.wiki_space, space_b.name)
+		self.assertIsNone(frappe.cache.hget(SPACE_TREE_CACHE_KEY, space_a.name))
+
+	def test_moving_group_to_top_level_clears_space_of_subtree(self):
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		page = create_wiki_document(group.name, "Page")
+
+		group.reload()
+		group.parent_wiki_document = None
+		group.save()
+
+		self.assertIsNone(frappe.db.get_value("Wiki Document", group.name, "wiki_space"))
+		self.assertIsNone(frappe.db.get_value("Wiki Document", page.name, "wiki_space"))
+
+	def test_reorder_to_top_level_clears_space_of_subtree(self):
+		from wiki.api.wiki_space import reorder_wiki_documents
+
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		page = create_wiki_document(group.name, "Page")
+
+		reorder_wiki_documents(group.name, None, 0, json.dumps([group.name]))
+
+		self.assertIsNone(frappe.db.get_value("Wiki Document", group.name, "parent_wiki_document"))
+		self.assertIsNone(frappe.db.get_value("Wiki Document", group.name, "wiki_space"))
+		self.assertIsNone(frappe.db.get_value("Wiki Document", page.name, "wiki_space"))
+		self.assertEqual(frappe.db.get_value("Wiki Document", space.root_group, "wiki_space"), space.name)
+
+
+class TestDirectReorderRevision(FrappeTestCase):
+	"""Tests for the revision recorded after a direct reorder."""
+
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+
+	def test_reorder_creates_delta_revision_matching_live_tree(self):
+		from wiki.api.wiki_space import reorder_wiki_documents
+		from wiki.frappe_wiki.doctype.wiki_revision.wiki_revision import create_revision_from_live_tree
+
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		create_wiki_document(space.root_group, "Page 1", content="One")
+		page2 = create_wiki_document(space.root_group, "Page 2", content="Two")
+		main = create_revision_from_live_tree(space.name, message="Initial main")
+		frappe.db.set_value("Wiki Space", space.name, "main_revision", main.name)
+
+		reorder_wiki_documents(page2.name, group.name, 0, json.dumps([page2.name]))
+
+		revision = frappe.get_doc(
+			"Wiki Revision", frappe.db.get_value("Wiki Space", space.name, "main_revision")
+		)
+		self.assertEqual(revision.parent_revision, main.name)
+		self.assertEqual(revision.content_hash, main.content_hash)
+		self.assertEqual(
+			frappe.db.count("Wiki Revision Item", {"revision": revision.name}),
+			frappe.db.count("Wiki Revision Item", {"revision": main.name}),
+		)
+
+		page2_item = frappe.db.get_value(
+			"Wiki Revision Item",
+			{
+				"revision": revision.name,
+				"doc_key": frappe.db.get_value("Wiki Document", page2.name, "doc_key"),
+			},
+			["parent_key", "order_index"],
+			as_dict=True,
+		)
+		self.assertEqual(page2_item.parent_key, frappe.db.get_value("Wiki Document", group.name, "doc_key"))
+		self.assertEqual(page2_item.order_index, 0)
+
+		snapshot = create_revision_from_live_tree(space.name)
+		self.assertEqual(revision.tree_hash, snapshot.tree_hash)
+		self.assertEqual(revision.content_hash, snapshot.content_hash)
+
+	def test_reorder_after_edit_snapshots_live_tree(self):
+		from wiki.api.wiki_space import reorder_wiki_documents
+		from wiki.frappe_wiki.doctype.wiki_revision.wiki_revision import create_revision_from_live_tree
+
+		space = create_test_wiki_space()
+		page1 = create_wiki_document(space.root_group, "Page 1", content="One")
+		page2 = create_wiki_document(space.root_group, "Page 2", content="Two")
+		main = create_revision_from_live_tree(space.name, message="Initial main")
+		frappe.db.set_value("Wiki Space", space.name, "main_revision", main.name)
+
+		page1.reload()
+		page1.content = "One, edited"
+		page1.save()
+		reorder_wiki_documents(page2.name, space.root_group, 0, json.dumps([page2.name, page1.name]))
+
+		revision = frappe.get_doc(
+			"Wiki Revision", frappe.db.get_value("Wiki Space", space.name, "main_revision")
+		)
+		self.assertNotEqual(revision.content_hash, main.content_hash)
+
+
+class TestTreeAccessor(FrappeTestCase):
+	"""Tests for ancestor, descendant and owning space lookups."""
+
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+
+	def test_lookups_use_nested_set_and_fall_back_to_parent_links(self):
+		from wiki.frappe_wiki.doctype.wiki_document.tree import (
+			get_ancestors,
+			get_descendants,
+			get_owning_space,
+		)
+
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		page = create_wiki_document(group.name, "Page")
+
+		self.assertEqual([row.name for row in get_ancestors(page.name)], [group.name, space.root_group])
+		self.assertEqual([row.name for row in get_descendants(space.root_group)], [group.name, page.name])
+		self.assertEqual(get_owning_space(page.name), space.name)
+
+		# Unnumbered rows are resolved through parent_wiki_document
+		frappe.db.set_value("Wiki Document", page.name, {"lft": 0, "rgt": 0}, update_modified=False)
+		self.assertEqual(
+			[row.name for row in get_ancestors(page.name, include_self=True)],
+			[page.name, group.name, space.root_group],
+		)
+		self.assertEqual(get_owning_space(page.name), space.name)
+
+	def test_route_of_new_document_includes_ancestor_slugs(self):
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Guides", is_group=True)
+		page = create_wiki_document(group.name, "Install")
+
+		self.assertEqual(page.route, f"{space.route}/{group.slug}/{page.slug}")
+
+
+class TestDeleteWithChildren(FrappeTestCase):
+	"""Tests for deleting a Wiki Document together with its subtree."""
+
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+
+	def test_subtree_is_deleted_and_interval_closed(self):
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		nested = create_wiki_document(group.name, "Nested", is_group=True)
+		page = create_wiki_document(nested.name, "Page")
+		sibling = create_wiki_document(space.root_group, "Sibling")
+		frappe.get_doc(
+			{"doctype": "Wiki Feedback", "wiki_document": page.name, "rating": 1, "feedback": "Useful"}
+		).insert(ignore_permissions=True)
+
+		result = group.delete_with_children()
+
+		self.assertEqual(result, {"deleted": group.name, "children_deleted": 2})
+		for name in (group.name, nested.name, page.name):
+			self.assertFalse(frappe.db.exists("Wiki Document", name))
+		self.assertFalse(frappe.db.exists("Wiki Feedback", {"wiki_document": page.name}))
+		self.assertTrue(
+			frappe.db.exists(
+				"Deleted Document", {"deleted_doctype": "Wiki Document", "deleted_name": page.name}
+			)
+		)
+
+		root = frappe.db.get_value("Wiki Document", space.root_group, ["lft", "rgt"], as_dict=True)
+		sibling_lr = frappe.db.get_value("Wiki Document", sibling.name, ["lft", "rgt"], as_dict=True)
+		self.assertEqual(root.rgt - root.lft, 3)
+		self.assertTrue(root.lft < sibling_lr.lft < sibling_lr.rgt < root.rgt)
+
+	def test_children_count_uses_permitted_rows(self):
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		nested = create_wiki_document(group.name, "Nested", is_group=True)
+		create_wiki_document(nested.name, "Page")
+		group.reload()
+
+		self.assertEqual(group.get_children_count(), 2)
+
+		create_test_user("wiki-count-user@example.com", roles=["Wiki User"])
+		frappe.set_user("wiki-count-user@example.com")
+		self.assertEqual(group.get_children_count(), 2)
+
+	def test_descendant_without_delete_permission_blocks_delete(self):
+		from frappe.permissions import setup_custom_perms
+
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		page = create_wiki_document(group.name, "Page")
+
+		# Wiki Users can read every document but delete only the ones they own
+		setup_custom_perms("Wiki Document")
+		frappe.get_doc(
+			{
+				"doctype": "Custom DocPerm",
+				"parent": "Wiki Document",
+				"parenttype": "DocType",
+				"parentfield": "permissions",
+				"role": "Wiki User",
+				"permlevel": 0,
+				"if_owner": 1,
+				"read": 1,
+				"delete": 1,
+			}
+		).insert(ignore_permissions=True)
+		frappe.clear_cache(doctype="Wiki Document")
+		self.addCleanup(frappe.clear_cache, doctype="Wiki Document")
+
+		user = create_test_user("wiki-delete-user@example.com", roles=["Wiki User"])
+		frappe.db.set_value("Wiki Document", group.name, "owner", user.name, update_modified=False)
+
+		frappe.set_user(user.name)
+		group.reload()
+		self.assertEqual(group.get_children_count(), 1)
+		with self.assertRaises(frappe.PermissionError):
+			group.delete_with_children()
+
+		self.assertTrue(frappe.db.exists("Wiki Document", group.name))
+		self.assertTrue(frappe.db.exists("Wiki Document", page.name))
+
+	def test_background_delete_checks_permission(self):
+		from wiki.frappe_wiki.doctype.wiki_document.wiki_document import delete_subtree_in_background
+
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		create_wiki_document(group.name, "Page")
+
+		create_test_user("wiki-reader@example.com", roles=["Wiki User"])
+		frappe.set_user("wiki-reader@example.com")
+		with self.assertRaises(frappe.PermissionError):
+			delete_subtree_in_background(group.name)
+
+		frappe.set_user("Administrator")
+		self.assertTrue(frappe.db.exists("Wiki Document", group.name))
+
+	def test_root_group_of_a_space_cannot_be_deleted(self):
+		space = create_test_wiki_space()
+		root = frappe.get_doc("Wiki Document", space.root_group)
+
+		with self.assertRaises(frappe.LinkExistsError):
+			root.delete_with_children()
+
+	def test_large_root_group_is_rejected_before_queueing(self):
+		from unittest.mock import patch
+
+		space = create_test_wiki_space()
+		create_wiki_document(space.root_group, "Page")
+		root = frappe.get_doc("Wiki Document", space.root_group)
+
+		module = "wiki.frappe_wiki.doctype.wiki_document.wiki_document"
+		with (
+			patch(f"{module}.BULK_DELETE_JOB_THRESHOLD", 0),
+			patch(f"{module}.frappe.enqueue") as enqueue,
+			self.assertRaises(frappe.LinkExistsError),
+		):
+			root.delete_with_children()
+
+		enqueue.assert_not_called()
+
+
+class TestRebuildSubtreeRoutes(FrappeTestCase):
+	"""Tests for recomputing the routes of a subtree from its slugs."""
+
+	def setUp(self):
+		frappe.set_user("Administrator")
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+
+	def test_routes_follow_renamed_and_moved_group(self):
+		space = create_test_wiki_space()
+		group_a = create_wiki_document(space.root_group, "Group A", is_group=True)
+		group_b = create_wiki_document(space.root_group, "Group B", is_group=True)
+		nested = create_wiki_document(group_a.name, "Nested", is_group=True)
+		page = create_wiki_document(nested.name, "Page")
+
+		group_a.reload()
+		group_a.slug = "renamed"
+		group_a.parent_wiki_document = group_b.name
+		group_a.save()
+
+		result = group_a.rebuild_routes()
+
+		prefix = f"{space.route}/{group_b.slug}/renamed"
+		self.assertEqual(result["updated_count"], 3)
+		self.assertEqual(frappe.db.get_value("Wiki Document", group_a.name, "route"), prefix)
+		self.assertEqual(
+			frappe.db.get_value("Wiki Document", nested.name, "route"), f"{prefix}/{nested.slug}"
+		)
+		self.assertEqual(
+			frappe.db.get_value("Wiki Document", page.name, "route"), f"{prefix}/{nested.slug}/{page.slug}"
+		)
+		self.assertEqual(group_a.rebuild_routes()["updated_count"], 0)
+
+	def test_colliding_leaf_route_is_rejected(self):
+		space = create_test_wiki_space()
+		group = create_wiki_document(space.root_group, "Group", is_group=True)
+		create_wiki_document(group.name, "Page")
+		other = create_wiki_document(space.root_group, "Other", is_group=True)
+		moved = create_wiki_document(other.name, "Page")
+
+		other.reload()
+		other.slug = group.slug
+		other.save()
+
+		with self.assertRaises(frappe.ValidationError):
+			other.rebuild_routes()
+		self.assertEqual(frappe.db.get_value("Wiki Document", moved.name, "route"), moved.route)
+
 
 # Helper functions
 
@@ -0,0 +1,83 @@
+# Copyright (c) 2025, Frappe and Contributors
+# See license.txt
+
+import json
+import os
+import shutil
+import tempfile
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from wiki.static_export import export_space, get_page_path
+from wiki.test_api import create_test_wiki_space
+
+
+class TestStaticExport(FrappeTestCase):
+	"""Tests for exporting a Wiki Space to static HTML."""
+
+	def setUp(self):
+		frappe.set_user("Administrator")
+		self.output_dir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+		shutil.rmtree(self.output_dir, ignore_errors=True)
+
+	def _create_page(self, space, title, content):
+		page = frappe.new_doc("Wiki Document")
+		page.title = title
+		page.parent_wiki_document = space.root_group
+		page.content = content
+		page.is_published = 1
+		page.insert()
+		return page
+
+	def test_export_writes_pages_sidebar_and_search_index(self):
+		space = create_test_wiki_space()
+		page = self._create_page(space, "Getting Started", content="# Hello\n\nWorld")
+
+		result = export_space(space.name, output_dir=self.output_dir, workers=1)
+
+		self.assertEqual(result["rendered"], 1)
+		with open(get_page_path(self.output_dir, page.route)) as f:
+			html = f.read()
+		self.assertIn("Hello", html)
+		# Exported pages show when they were updated, not how long ago
+		self.assertIn(f"Last updated on {frappe.utils.format_date(page.modified)}", html)
+
+		with open(os.path.join(self.output_dir, "_wiki", "search-index.json")) as f:
+			self.assertEqual(
+				json.load(f), [{"title": "Getting Started", "route": page.route, "content": "Hello World"}]
+			)
+
+		with open(os.path.join(self.output_dir, "_wiki", "sidebar.json")) as f:
+			self.assertEqual(json.load(f)["nested_tree"][0]["route"], page.route)
+
+	def test_reexport_only_renders_changed_pages(self):
+		space = create_test_wiki_space()
+		self._create_page(space, "Page 1", content="One")
+		page2 = self._create_page(space, "Page 2", content="Two")
+		export_space(space.name, output_dir=self.output_dir, workers=1)
+
+		result = export_space(space.name, output_dir=self.output_dir, workers=1)
+		self.assertEqual((result["rendered"], result["skipped"]), (0, 2))
+
+		page2.content = "Two, edited"
+		page2.save()
+		result = export_space(space.name, output_dir=self.output_dir, workers=1)
+		self.assertEqual((result["rendered"], result["skipped"]), (1, 1))
+
+	def test_unpublished_pages_are_removed(self):
+		space = create_test_wiki_space()
+		self._create_page(space, "Page 1", content="One")
+		page2 = self._create_page(space, "Page 2", content="Two")
+		export_space(space.name, output_dir=self.output_dir, workers=1)
+
+		page2.is_published = 0
+		page2.save()
+		result = export_space(space.name, output_dir=self.output_dir, workers=1)
+
+		self.assertEqual(result["removed"], 1)
+		self.assertFalse(os.path.exists(get_page_path(self.output_dir, page2.route)))
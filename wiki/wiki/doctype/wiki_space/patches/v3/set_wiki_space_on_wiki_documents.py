@@ -0,0 +1,22 @@
+import frappe
+
+
+def execute():
+	"""Backfill the owning Wiki Space of every Wiki Document from its space's root group."""
+	spaces = frappe.get_all(
+		"Wiki Space", filters={"root_group": ("is", "set")}, fields=["name", "root_group"]
+	)
+	for space in spaces:
+		bounds = frappe.db.get_value("Wiki Document", space.root_group, ["lft", "rgt"])
+		if not bounds:
+			continue
+
+		lft, rgt = bounds
+		frappe.db.sql(
+			"""
+			UPDATE `tabWiki Document`
+			SET wiki_space = %s
+			WHERE lft >= %s AND rgt <= %s
+			""",
+			(space.name, lft, rgt),
+		)
@@ -3,6 +3,13 @@
 import frappe
 from frappe.model.document import Document
 
+from wiki.frappe_wiki.doctype.wiki_document.cache import (
+	clear_page_html_cache,
+	clear_space_cache,
+	clear_space_chrome_cache,
+)
+from wiki.frappe_wiki.doctype.wiki_document.wiki_document import set_wiki_space_for_subtree
+
 
 class WikiSpace(Document):
 	# begin: auto-generated types
@@ -37,6 +44,23 @@ class WikiSpace(Document):
 	def validate(self):
 		self.remove_leading_slash_from_route()
 
+	def on_update(self):
+		if self.root_group and self.has_value_changed("root_group"):
+			set_wiki_space_for_subtree(self.root_group, self.name)
+		clear_space_cache(self.name)
+		# Every public page lists the spaces in its switcher
+		clear_space_chrome_cache()
+		clear_page_html_cache()
+
+	def on_trash(self):
+		# Detach the documents so the link to this space does not block deletion
+		frappe.db.set_value(
+			"Wiki Document", {"wiki_space": self.name}, "wiki_space", None, update_modified=False
+		)
+		clear_space_cache(self.name)
+		clear_space_chrome_cache()
+		clear_page_html_cache()
+
 	def remove_leading_slash_from_route(self):
 		if self.route and self.route.startswith("/"):
 			self.route = self.route[1 : len(self.route)]
@@ -179,6 +203,7 @@ class WikiSpace(Document):
 				WHEN route LIKE %s THEN CONCAT(%s, SUBSTRING(route, %s))
 				ELSE route
 			END,
+			wiki_space = %s,
 			modified = NOW(),
 			modified_by = %s
 			WHERE name IN ({placeholders})
@@ -189,6 +214,7 @@ class WikiSpace(Document):
 				f"{old_route}/%",  # starts with old route (children)
 				new_route,  # new prefix
 				len(old_route) + 1,  # substring position after old_route
+				self.name,  # every document under the root group belongs to this space
 				frappe.session.user,
 				*doc_names,
 			),
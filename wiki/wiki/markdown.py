@@ -16,11 +16,21 @@ Syntax:
 Supported types: note, tip, caution, danger, warning (alias for caution)
 """
 
+import hashlib
+import multiprocessing
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from html import unescape
-from urllib.parse import quote
 
 import mistune
+from mistune.helpers import unescape_char
+from mistune.util import escape_url
+
+# Bump whenever the HTML produced for the same Markdown changes, so cached
+# renders keyed by content hash are not reused across renderer changes.
+RENDERER_VERSION = 4
 
 
 def slugify(text: str) -> str:
@@ -65,13 +75,15 @@ CALLOUT_ICONS = {
 	"danger": '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M12 22s8-4 8-10V5l-8-3-8 3v7c0 6 8 10 8 10"/><path d="M12 8v4"/><path d="M12 16h.01"/></svg>',
 }
 
-# Pattern to match callout blocks
+# Opening line of a callout block, registered as a mistune block rule
 # Matches: :::type or :::type[title] or :::type\[title] (escaped bracket from editor)
-# Content continues until closing :::
-CALLOUT_PATTERN = re.compile(
-	r"^:::(?P<type>note|tip|caution|danger|warning)(?:\\?\[(?P<title>[^\]]*)\])?\s*\n(?P<content>[\s\S]*?)\n:::[ \t]*$",
-	re.MULTILINE,
+CALLOUT_OPEN = (
+	r"^:::(?P<callout_type>note|tip|caution|danger|warning)"
+	r"(?:\\?\[(?P<callout_title>[^\]\n]*)\])?[ \t]*(?:\n|$)"
 )
+CALLOUT_OPEN_RE = re.compile(CALLOUT_OPEN)
+CALLOUT_CLOSE_RE = re.compile(r"^:::[ \t]*$")
+FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
 
 
 def _generate_callout_html(callout_type, title, inner_html):
@@ -97,105 +109,123 @@ def _generate_callout_html(callout_type, title, inner_html):
 	)
 
 
-def _process_callouts_with_placeholders(content):
+def _find_callout_end(src: str, pos: int, end: int) -> tuple[int, int] | None:
 	"""
-	Replace callout blocks with placeholders, returning the modified content
-	and a list of callout data to be processed later.
+	Find the `:::` line closing the callout whose body starts at `pos`.
+
+	Nested callouts open a new level, and lines inside fenced code are skipped.
+	Returns (start, end) of the closing line, or None if the callout is not closed.
 	"""
-	callouts = []
-	# Use HTML comment-like placeholder that won't be parsed as markdown
-	placeholder_prefix = "WIKICALLOUTPLACEHOLDER"
-
-	def replacer(match):
-		callout_type = match.group("type")
-		title = match.group("title") or ""
-		inner_content = match.group("content")
-
-		# Remove escape backslashes from title (editor escapes special chars like !)
-		if title:
-			title = title.replace("\\", "")
-
-		idx = len(callouts)
-		callouts.append(
-			{
-				"type": callout_type,
-				"title": title,
-				"content": inner_content.strip(),
-			}
-		)
-		# Return placeholder - use format that won't be parsed as markdown
-		return f"\n\n{placeholder_prefix}{idx}END\n\n"
-
-	# Process callouts (may be nested, so we process iteratively)
-	prev_content = None
-	while prev_content != content:
-		prev_content = content
-		content = CALLOUT_PATTERN.sub(replacer, content)
-
-	return content, callouts, placeholder_prefix
-
-
-def _replace_callout_placeholders(html, callouts, placeholder_prefix, md_instance):
-	"""Replace callout placeholders with actual HTML after markdown rendering."""
-	for idx, callout in enumerate(callouts):
-		placeholder = f"{placeholder_prefix}{idx}END"
-		# The placeholder might be wrapped in <p> tags, so handle both cases
-		inner_html = md_instance(callout["content"]) if callout["content"] else ""
-		callout_html = _generate_callout_html(callout["type"], callout["title"], inner_html)
-
-		# Replace placeholder (may be wrapped in <p> tags)
-		html = html.replace(f"<p>{placeholder}</p>", callout_html)
-		html = html.replace(placeholder, callout_html)
+	depth = 1
+	fence = None
+	while pos < end:
+		line_end = src.find("\n", pos, end)
+		next_pos = end if line_end == -1 else line_end + 1
+		line = src[pos:next_pos].rstrip("\n")
+
+		fence_match = FENCE_RE.match(line)
+		if fence:
+			if (
+				fence_match
+				and fence_match.group(1)[0] == fence[0]
+				and len(fence_match.group(1)) >= len(fence)
+			):
+				fence = None
+		elif fence_match:
+			fence = fence_match.group(1)
+		elif CALLOUT_OPEN_RE.match(line):
+			depth += 1
+		elif CALLOUT_CLOSE_RE.match(line):
+			depth -= 1
+			if not depth:
+				return pos, next_pos
+
+		pos = next_pos
+	return None
+
+
+def parse_callout(block, m, state):
+	"""Parse a callout and its body, including nested callouts, as part of the block pass."""
+	closing = _find_callout_end(state.src, m.end(), state.cursor_max)
+	if not closing:
+		# Unclosed callouts are left as plain text
+		return None
+
+	child = state.child_state(state.src[m.end() : closing[0]])
+	rules = None
+	if state.depth() >= block.max_nested_level - 1:
+		rules = [rule for rule in block.rules if rule != "callout"]
+	block.parse(child, rules)
+
+	# Remove escape backslashes from title (editor escapes special chars like !)
+	title = (m.group("callout_title") or "").replace("\\", "")
+	state.append_token(
+		{
+			"type": "callout",
+			"attrs": {"callout_type": m.group("callout_type"), "title": title},
+			"children": child.tokens,
+		}
+	)
+	return closing[1]
 
-	return html
 
+def render_callout(renderer, text, callout_type, title):
+	return _generate_callout_html(callout_type, title, text) + "\n"
 
-# Pattern to match markdown image syntax: ![alt](url) or ![alt](url "title")
-# Captures: alt text, URL, and optional title
-IMAGE_PATTERN = re.compile(
-	r'!\[([^\]]*)\]\(([^)"\s]+(?:\s[^)]*)?)\)',
-)
 
+def callouts(md):
+	"""
+	Mistune plugin for Starlight-style callouts.
 
-def _encode_image_url_spaces(content: str) -> str:
+	Callouts are block tokens, so their bodies (and nested callouts) are parsed in
+	the same pass as the rest of the document.
 	"""
-	Pre-process markdown to URL-encode spaces in image URLs.
+	md.block.register("callout", CALLOUT_OPEN, parse_callout, before="fenced_code")
+	if md.renderer and md.renderer.NAME == "html":
+		md.renderer.register("callout", render_callout)
 
-	Mistune (unlike markdown2) doesn't handle spaces in URLs, so we need to
-	encode them before parsing. This function finds all image syntax and
-	encodes spaces in the URL portion.
 
-	Args:
-	    content: Markdown string
+# Image whose URL contains spaces: ![alt](url) or ![alt](url "title").
+# Images without spaces never match and are left to mistune's own link rule.
+SPACED_IMAGE = (
+	r"!\[(?P<spaced_image_alt>[^\]]*)\]\("
+	r'(?P<spaced_image_url>[^)"\s<]+(?: +[^)"\s][^)\s]*)+)'
+	r'(?:\s+"(?P<spaced_image_title>[^"]*)")?[ \t]*\)'
+)
 
-	Returns:
-	    Markdown string with spaces in image URLs encoded as %20
-	"""
 
-	def encode_url(match):
-		alt_text = match.group(1)
-		url_part = match.group(2)
+def parse_spaced_image(inline, m, state):
+	# Older mistune 3 releases have no image nesting limit
+	max_depth = getattr(inline, "max_image_depth", None)
+	depth = getattr(state, "image_depth", 0)
+	if max_depth and depth >= max_depth:
+		state.append_token({"type": "text", "raw": m.group(0)})
+		return m.end()
 
-		# Split URL and optional title (title is in quotes after a space)
-		# e.g., '/path/to/image.png "Image Title"'
-		title_match = re.match(r'^([^"]+?)(?:\s+"([^"]*)")?$', url_part)
-		if title_match:
-			url = title_match.group(1).strip()
-			title = title_match.group(2)
-		else:
-			url = url_part
-			title = None
+	# Mistune (unlike markdown2) stops a link destination at the first space,
+	# so only spaces are encoded here; other characters are escaped as usual
+	url = m.group("spaced_image_url").replace(" ", "%20")
+	attrs = {"url": escape_url(unescape_char(url))}
+	title = m.group("spaced_image_title")
+	if title:
+		attrs["title"] = unescape_char(title)
 
-		# Only encode spaces, preserve other characters
-		# quote() with safe='' would encode everything, but we only want spaces
-		encoded_url = url.replace(" ", "%20")
+	alt_state = state.copy()
+	alt_state.src = m.group("spaced_image_alt")
+	alt_state.in_image = True
+	alt_state.image_depth = depth + 1
+	state.append_token({"type": "image", "children": inline.render(alt_state), "attrs": attrs})
+	return m.end()
 
-		# Reconstruct the image syntax
-		if title:
-			return f'![{alt_text}]({encoded_url} "{title}")'
-		return f"![{alt_text}]({encoded_url})"
 
-	return IMAGE_PATTERN.sub(encode_url, content)
+def spaced_images(md):
+	"""
+	Mistune plugin that URL-encodes spaces in image URLs.
+
+	Being an inline rule, it never sees code blocks or code spans, so image
+	syntax in code samples is left as written.
+	"""
+	md.inline.register("spaced_image", SPACED_IMAGE, parse_spaced_image, before="link")
 
 
 class WikiRenderer(mistune.HTMLRenderer):
@@ -212,6 +242,10 @@ class WikiRenderer(mistune.HTMLRenderer):
 
 	def __init__(self, **kwargs):
 		super().__init__(**kwargs)
+		self.reset()
+
+	def reset(self):
+		"""Forget the headings of the previous document so the renderer can be reused."""
 		self._heading_slugs = {}  # Track used slugs to avoid duplicates
 		self._headings = []  # Track headings for TOC
 
@@ -244,6 +278,36 @@ class WikiRenderer(mistune.HTMLRenderer):
 		return self._headings
 
 
+# Mistune parsers are not thread-safe (the renderer collects headings), so each
+# thread builds its own once and reuses it for every render
+_parsers = threading.local()
+
+MARKDOWN_PLUGINS = [
+	callouts,
+	spaced_images,
+	"strikethrough",
+	"footnotes",
+	"table",
+	"task_lists",
+]
+
+
+def get_markdown_parser() -> tuple[mistune.Markdown, WikiRenderer]:
+	"""
+	Get this thread's Markdown parser and its renderer, building them on first use.
+
+	Plugin registration and rule compilation happen once per thread; callers
+	reset the renderer before each document.
+	"""
+	parser = getattr(_parsers, "parser", None)
+	if parser is None:
+		# Note: escape=False must be passed to the renderer, not create_markdown
+		renderer = WikiRenderer(escape=False)
+		md = mistune.create_markdown(renderer=renderer, plugins=MARKDOWN_PLUGINS)
+		parser = _parsers.parser = (md, renderer)
+	return parser
+
+
 def render_markdown_with_toc(content: str) -> tuple[str, list]:
 	"""
 	Convert markdown content to HTML with callout support, and extract TOC headings.
@@ -257,30 +321,11 @@ def render_markdown_with_toc(content: str) -> tuple[str, list]:
 	if not content:
 		return "", []
 
-	# Create a base Mistune markdown instance with custom renderer
-	# Note: escape=False must be passed to the renderer, not create_markdown
-	renderer = WikiRenderer(escape=False)
-	md = mistune.create_markdown(
-		renderer=renderer,
-		plugins=[
-			"strikethrough",
-			"footnotes",
-			"table",
-			"task_lists",
-		],
-	)
-
-	# Step 1: URL-encode spaces in image URLs (mistune doesn't handle them)
-	processed_content = _encode_image_url_spaces(content)
+	md, renderer = get_markdown_parser()
+	renderer.reset()
 
-	# Step 2: Extract callouts and replace with placeholders
-	processed_content, callouts, placeholder_prefix = _process_callouts_with_placeholders(processed_content)
-
-	# Step 3: Render markdown (placeholders will be wrapped in <p> tags)
-	html = md(processed_content)
-
-	# Step 4: Replace placeholders with actual callout HTML
-	html = _replace_callout_placeholders(html, callouts, placeholder_prefix, md)
+	# Render markdown, callouts and image URLs with spaces included
+	html = md(content)
 
 	# Get the headings extracted during rendering
 	headings = renderer.get_headings()
@@ -300,3 +345,46 @@ def render_markdown(content: str) -> str:
 	"""
 	html, _ = render_markdown_with_toc(content)
 	return html
+
+
+# Smaller batches are rendered in-process, as starting workers would cost more
+BATCH_PROCESS_THRESHOLD = 20
+# Documents handed to a worker process at a time
+BATCH_CHUNK_SIZE = 8
+
+
+def render_markdown_batch(contents: list[str], workers: int | None = None) -> list[tuple[str, list]]:
+	"""
+	Render many markdown documents, spreading the work across processes.
+
+	Identical documents (same content hash) are rendered once. Used to warm the
+	rendered content cache of a whole space.
+
+	Args:
+	    contents: Markdown strings to convert
+	    workers: Number of render processes, defaults to the CPU count
+
+	Returns:
+	    List of (HTML string, TOC headings), in the order of `contents`
+	"""
+	unique = {}
+	hashes = []
+	for content in contents:
+		content_hash = hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+		unique.setdefault(content_hash, content or "")
+		hashes.append(content_hash)
+
+	workers = min(workers or os.cpu_count() or 1, len(unique))
+	if workers <= 1 or len(unique) < BATCH_PROCESS_THRESHOLD:
+		rendered = [render_markdown_with_toc(content) for content in unique.values()]
+	else:
+		# Spawn fresh interpreters instead of forking the caller's connections and threads
+		with ProcessPoolExecutor(
+			max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+		) as executor:
+			rendered = list(
+				executor.map(render_markdown_with_toc, unique.values(), chunksize=BATCH_CHUNK_SIZE)
+			)
+
+	results = dict(zip(unique, rendered, strict=True))
+	return [results[content_hash] for content_hash in hashes]
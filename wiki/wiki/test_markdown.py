@@ -1,9 +1,19 @@
 # Copyright (c) 2025, Frappe and Contributors
 # See license.txt
 
+import threading
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
 
-from wiki.wiki.markdown import render_markdown, render_markdown_with_toc
+import mistune
+
+from wiki.wiki.markdown import (
+	get_markdown_parser,
+	render_markdown,
+	render_markdown_batch,
+	render_markdown_with_toc,
+)
 
 
 class TestMarkdownRenderer(unittest.TestCase):
@@ -194,7 +204,7 @@ Some text between images.
 class TestCalloutRendering(unittest.TestCase):
 	"""Tests for callout/aside rendering.
 
-	Note: Callouts use a preprocessing step before markdown rendering.
+	Note: Callouts are parsed as a block rule during markdown rendering.
 	The callout must start at the beginning of a line in the document.
 	"""
 
@@ -254,6 +264,48 @@ Content
 		result = render_markdown(content)
 		self.assertIn("Custom Title", result)
 
+	def test_nested_callouts(self):
+		"""Test a callout nested in another one is rendered inside it."""
+		content = """:::note
+Outer
+:::tip[Inner]
+Inner body
+:::
+Outer again
+:::
+"""
+		result = render_markdown(content)
+		outer, inner = result.split('<aside class="callout callout-tip">')
+		self.assertIn("callout-note", outer)
+		self.assertIn("<p>Outer</p>", outer)
+		self.assertIn('<span class="callout-title">Inner</span>', inner)
+		self.assertIn("<p>Inner body</p>", inner)
+		self.assertIn("<p>Outer again</p>", inner.split("</aside>", 1)[1])
+		self.assertNotIn(":::", result)
+
+	def test_closing_marker_inside_code_block(self):
+		"""Test a ::: line inside a fenced code block does not close the callout."""
+		content = """:::note
+```
+:::
+```
+:::
+"""
+		result = render_markdown(content)
+		self.assertIn("<pre><code>:::\n</code></pre>\n</div>", result)
+		self.assertEqual(result.count("<aside"), 1)
+
+	def test_unclosed_callout_is_plain_text(self):
+		"""Test a callout without closing marker is left as text."""
+		result = render_markdown(":::note\nNo end")
+		self.assertNotIn("<aside", result)
+		self.assertIn(":::note", result)
+
+	def test_callout_headings_are_in_toc(self):
+		"""Test headings inside callouts share slugs and TOC with the page."""
+		html, headings = render_markdown_with_toc("## Setup\n\n:::note\n## Setup\n:::\n")
+		self.assertEqual([heading["id"] for heading in headings], ["setup", "setup-1"])
+
 
 class TestComplexMarkdownContent(unittest.TestCase):
 	"""Tests for complex markdown content with callouts and images."""
@@ -360,6 +412,46 @@ class TestImageUrlSpaceEncoding(unittest.TestCase):
 		self.assertIn('<img src="/files/my%20image.png"', result)
 		self.assertNotIn("%2520", result)
 
+	def test_image_syntax_in_fenced_code_unchanged(self):
+		"""Test that image syntax inside a fenced code block is not rewritten."""
+		content = "```markdown\n![Shot](/files/my image.png)\n```\n\n![Shot](/files/my image.png)"
+		result = render_markdown(content)
+
+		self.assertIn("![Shot](/files/my image.png)", result)
+		self.assertIn('<img src="/files/my%20image.png"', result)
+
+	def test_image_syntax_in_inline_code_unchanged(self):
+		"""Test that image syntax inside an inline code span is not rewritten."""
+		content = "Write `![Shot](/files/my image.png)` to embed ![Shot](/files/my image.png)"
+		result = render_markdown(content)
+
+		self.assertIn("<code>![Shot](/files/my image.png)</code>", result)
+		self.assertIn('<img src="/files/my%20image.png"', result)
+
+	def test_multiple_images_with_titles(self):
+		"""Test that every image in a document is encoded."""
+		content = '![A](/files/a b.png "First")\n\n![B](/files/c d.png)'
+		result = render_markdown(content)
+
+		self.assertIn('<img src="/files/a%20b.png" alt="A" title="First"', result)
+		self.assertIn('<img src="/files/c%20d.png" alt="B"', result)
+
+	def test_unmatched_backtick_before_image(self):
+		"""Test that a stray backtick does not stop later images from being encoded."""
+		content = "A stray ` tick\n\n![Shot](/files/my screen.png)\n\nLater `code`"
+		result = render_markdown(content)
+
+		self.assertIn('<img src="/files/my%20screen.png" alt="Shot"', result)
+		self.assertIn("<code>code</code>", result)
+
+	def test_escaped_backtick_before_image(self):
+		"""Test that an escaped backtick does not open a code span over an image."""
+		content = "Use \\` here\n\n![Shot](/files/my screen.png)\n\nand `code`"
+		result = render_markdown(content)
+
+		self.assertIn('<img src="/files/my%20screen.png" alt="Shot"', result)
+		self.assertIn("<code>code</code>", result)
+
 
 class TestRawHTMLRendering(unittest.TestCase):
 	"""Tests for raw HTML rendering in markdown.
@@ -591,5 +683,81 @@ More text."""
 			self.assertIn(expected_tag, html)
 
 
+class TestParserReuse(unittest.TestCase):
+	"""Tests for reusing the per-thread Markdown parser."""
+
+	def test_parser_is_built_once_per_thread(self):
+		"""Test that consecutive renders share the same parser."""
+		render_markdown("first")
+		parser = get_markdown_parser()
+		render_markdown("second")
+		self.assertIs(get_markdown_parser(), parser)
+
+		other = []
+		thread = threading.Thread(target=lambda: other.append(get_markdown_parser()))
+		thread.start()
+		thread.join()
+		self.assertIsNot(other[0], parser)
+
+	def test_state_is_reset_between_renders(self):
+		"""Test that heading slugs and TOC do not leak into the next document."""
+		first_html, first_headings = render_markdown_with_toc("## Setup\n\n## Setup")
+		second_html, second_headings = render_markdown_with_toc("## Setup")
+
+		self.assertEqual([h["id"] for h in first_headings], ["setup", "setup-1"])
+		self.assertEqual(second_headings, [{"id": "setup", "text": "Setup", "level": 2}])
+		self.assertIn('<h2 id="setup">', second_html)
+
+	def test_render_does_not_rebuild_parser(self):
+		"""Test that renders on a thread build the parser only on first use."""
+		calls = []
+
+		def render_twice():
+			with patch("wiki.wiki.markdown.mistune.create_markdown", wraps=mistune.create_markdown) as create:
+				render_markdown("first")
+				render_markdown("second")
+				calls.append(create.call_count)
+
+		thread = threading.Thread(target=render_twice)
+		thread.start()
+		thread.join()
+		self.assertEqual(calls, [1])
+
+
+class TestBatchRender(unittest.TestCase):
+	"""Tests for rendering many documents at once."""
+
+	def test_batch_matches_single_renders_in_order(self):
+		"""Test that results line up with the input, duplicates included."""
+		contents = ["## One\n\nFirst", "Second *page*", "## One\n\nFirst", "", None]
+		results = render_markdown_batch(contents, workers=1)
+
+		self.assertEqual(len(results), len(contents))
+		self.assertEqual(results[0], render_markdown_with_toc("## One\n\nFirst"))
+		self.assertEqual(results[1], render_markdown_with_toc("Second *page*"))
+		self.assertEqual(results[2], results[0])
+		self.assertEqual(results[3], ("", []))
+		self.assertEqual(results[4], ("", []))
+
+	def test_duplicates_are_rendered_once(self):
+		"""Test that identical documents are deduplicated by content hash."""
+		with patch("wiki.wiki.markdown.render_markdown_with_toc", wraps=render_markdown_with_toc) as render:
+			render_markdown_batch(["same"] * 5 + ["other"], workers=1)
+
+		self.assertEqual(render.call_count, 2)
+
+	def test_process_pool_matches_serial_render(self):
+		"""Test that batches above the threshold are rendered by worker processes, in order."""
+		contents = [f"## Page {i}\n\nText *{i}*" for i in range(4)] + ["## Page 0\n\nText *0*"]
+		with (
+			patch("wiki.wiki.markdown.BATCH_PROCESS_THRESHOLD", 2),
+			patch("wiki.wiki.markdown.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool,
+		):
+			results = render_markdown_batch(contents, workers=2)
+
+		pool.assert_called_once()
+		self.assertEqual(results, render_markdown_batch(contents, workers=1))
+
+
 if __name__ == "__main__":
 	unittest.main()